@@ -1,12 +1,11 @@
 from game.state import State
 from game.informed_search import InformedSearchSolver
 from game.uninformed_search import UninformedSearchSolver
-import numpy as np
 import time
 
 def compare_time():
-    init_tile = np.array([[1, 2, 3], [0, 4, 6], [7, 5, 8]])
-    goal_tile = np.array([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+    init_tile = [[1, 2, 3], [0, 4, 6], [7, 5, 8]]
+    goal_tile = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
 
     init = State(init_tile)
     goal = State(goal_tile)
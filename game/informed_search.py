@@ -1,8 +1,7 @@
-import numpy as np
 from .state import State
-import sys
+from .transposition import TranspositionTable
 import enum
-from typing import List, Tuple, Optional
+from typing import Dict, List, Optional
 from math import sqrt, floor
 
 """
@@ -29,75 +28,79 @@ class InformedSearchSolver:
     """Implements Best First Search
     """
 
-    opened: List[State] = []
-    closed: List[State] = []
+    opened: List[State]
+    opened_keys: Dict[int, State]
+    closed: TranspositionTable
     depth = 0
 
-    def __init__(self, current: State, target: State):
+    def __init__(self, current: State, target: State, expected: int = 1024):
         self.current_state = current
         self.target_state = target
+        self.target_key = target.key()
+        self.closed = TranspositionTable(expected)
 
         if not self.is_solvable():
             raise RuntimeError("Unsolvable")
 
         self.opened = [current]
+        self.opened_keys = {current.key(): current}
 
-    def check_inclusive(self, item: State) -> Tuple[GeneratedStateType, int]:
-        """ Check if the generated state is in open and/or closed. """
-        is_in_closed = item in self.closed
-        is_in_open = item in self.opened
+    def check_inclusive(self, key: int) -> GeneratedStateType:
+        """ Check if the generated board is in open or closed. """
+        if key in self.opened_keys:
+            return GeneratedStateType.ON_OPEN
 
-        index = -1
-        state_type = GeneratedStateType.NEITHER
+        if key in self.closed:
+            return GeneratedStateType.ON_CLOSED
 
-        if is_in_closed:
-            index = self.closed.index(item)
+        return GeneratedStateType.NEITHER
 
-        if is_in_open:
-            index = self.opened.index(item)
+    def open(self, child: State):
+        """ Adds a state to the open list. """
+        self.opened.append(child)
+        self.opened_keys[child.key()] = child
 
-        if is_in_open and not is_in_closed:
-            state_type = GeneratedStateType.ON_OPEN
-        elif not is_in_open and is_in_closed:
-            state_type = GeneratedStateType.ON_CLOSED
-
-        return state_type, index
-
-    def check_conditions(self, child: State):
+    def check_conditions(self, parent: State, key: int, blank: int, direction: str):
         """ Checks the inclusivity in the open/closed lists and moves the states accordingly.
 
+        The child state is only built when it is actually added to the open list.
+
         Args:
-            `state` - State object
+            `parent` - State object being expanded
+            `key` - packed board of the child, from `State.successors`
+            `blank` - index of the empty tile in the child
+            `direction` - move that produced the child
         """
-        state_type, index = self.check_inclusive(child)
+        state_type = self.check_inclusive(key)
 
         if state_type is GeneratedStateType.NEITHER:
-
+            child = parent.expand(key, direction, blank)
             child.weight = child.heuristic_score(self.target_state, self.depth)
 
-            self.opened.append(child)
+            self.open(child)
 
         elif state_type is GeneratedStateType.ON_OPEN:
-            if child.depth < self.current_state.depth:
-                self.opened[index].depth = child.depth
+            if self.depth < self.current_state.depth:
+                self.opened_keys[key].depth = self.depth
 
         else:
-            if child.depth < self.current_state.depth:
-                self.closed.remove(child)
-                self.opened.append(child)
+            if self.depth < self.current_state.depth:
+                self.closed.remove(key)
+                self.open(parent.expand(key, direction, blank))
 
     def next_state(self):
         """Find next state"""
         if self.is_solved():
             raise StopIteration
         observed_state = self.opened.pop(0)
-        self.closed.append(observed_state)
+        del self.opened_keys[observed_state.key()]
+        self.closed.add(observed_state.key(), observed_state.depth, observed_state.move_code())
 
         # Get current states graph.
         self.depth = observed_state.depth + 1
 
-        for item in observed_state.neighbors():
-            self.check_conditions(item)
+        for key, blank, direction in observed_state.successors():
+            self.check_conditions(observed_state, key, blank, direction)
 
         # Sort the open list first by h(n) then g(n).
         self.opened.sort(key=lambda a: a.weight)
@@ -109,7 +112,7 @@ class InformedSearchSolver:
         Returns:
             bool: is puzzle solved
         """
-        return self.current_state == self.target_state
+        return self.current_state.key() == self.target_key
 
     def is_solvable(self) -> bool:
         """Detects if the current puzzle has a solution
@@ -118,7 +121,15 @@ class InformedSearchSolver:
             bool: if the puzzle is solvable
         """
 
-        return self.current_state.tile_reversals(self.target_state) % 2 == 0
+        return self.current_state.is_reachable(self.target_state)
+
+    def path(self) -> List[str]:
+        """Moves from the initial state to the current state
+
+        Returns:
+            List[str]: moves of the empty tile, in order
+        """
+        return self.current_state.path(self.closed)
 
     def run(self) -> int:
         """Runs the search"""
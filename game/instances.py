@@ -0,0 +1,286 @@
+import json
+import mmap
+import random
+import struct
+from array import array
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from .optimal_search import OptimalSearchSolver
+from .state import State
+from .transposition import TranspositionTable
+
+"""
+Random puzzle instances with a known optimal solution length.
+
+A `DistanceTable` walks breadth-first out of the goal board, so every board in it
+is solvable and its layer is its optimal distance to the goal. Instances are
+drawn from the layers with a seeded random generator, so the same seed always
+gives the same instances.
+
+Layers of boards larger than 3x3 keep doubling, so their tables stop at
+`MAX_TABLE_DEPTH`. Deeper instances come from `walks`, which labels random walks
+with the optimal depth found by A*.
+
+Instances stream to and from corpus files in two formats:
+
+* `.jsonl` - one {"start": [[...]], "goal": [[...]], "depth": n} object per line
+* anything else - binary, a `CORPUS_MAGIC` header followed by fixed size
+  little-endian records of `RECORD` (start key, goal key, width, height, depth)
+
+Binary corpora are read through a memory map, either record by record with
+`read_corpus` or as one NumPy structured array with `map_corpus`.
+"""
+
+CORPUS_MAGIC = b"PZC1"
+RECORD = struct.Struct("<QQBBH")
+
+# Deepest table built for boards larger than 3x3, about 240,000 boards on 4x4
+MAX_TABLE_DEPTH = 16
+
+
+class Instance(NamedTuple):
+    """A start board, its goal and the optimal number of moves between them"""
+
+    start: State
+    goal: State
+    depth: int
+
+
+class DistanceTable:
+    """Optimal distances from the boards around a goal to the goal"""
+
+    def __init__(self, goal: State, max_depth: Optional[int] = None):
+        """Searches breadth-first out of the goal.
+
+        Args:
+            goal (State): Goal board
+            max_depth (int): Depth to stop at, the whole puzzle if None. Needed
+                for boards larger than 3x3, whose full tables do not fit in memory.
+
+        Raises:
+            ValueError: If a board larger than 3x3 asks for more than `MAX_TABLE_DEPTH`
+        """
+        if goal.width * goal.height > 9 and (max_depth is None or max_depth > MAX_TABLE_DEPTH):
+            raise ValueError(
+                f"Distance tables of boards larger than 3x3 stop at depth {MAX_TABLE_DEPTH}, "
+                "use random walks for deeper instances"
+            )
+
+        self.goal = goal
+        self.table = TranspositionTable()
+        self.table.add(goal.key(), 0)
+        self.layers: List[array] = [array("Q", [goal.key()])]
+
+        while max_depth is None or len(self.layers) <= max_depth:
+            layer = array("Q")
+            for key in self.layers[-1]:
+                board = State.from_key(key, goal.width, goal.height)
+                for child, _, _ in board.successors():
+                    if child not in self.table:
+                        self.table.add(child, len(self.layers))
+                        layer.append(child)
+
+            if not layer:
+                break
+            self.layers.append(layer)
+
+    @property
+    def max_depth(self) -> int:
+        """Deepest layer in the table"""
+        return len(self.layers) - 1
+
+    def depth(self, state: State) -> int:
+        """Looks up the optimal solution length of a board
+
+        Raises:
+            KeyError: If the board is deeper than the table or unsolvable
+        """
+        return self.table.get(state.key())[0]
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+
+def goal_board(size: int) -> State:
+    """Builds the usual goal: tiles 1, 2, 3, ... row by row with the empty tile last
+
+    Returns:
+        State: square goal board
+    """
+    tiles = list(range(1, size * size)) + [0]
+    return State([tiles[row * size : (row + 1) * size] for row in range(size)])
+
+
+def depth_range(depths: Union[int, Tuple[int, int]]) -> Tuple[int, int]:
+    """Normalizes an exact depth or an inclusive (lowest, highest) range"""
+    if isinstance(depths, int):
+        return depths, depths
+    return depths[0], depths[1]
+
+
+def generate(
+    goal: State,
+    depths: Union[int, Tuple[int, int]],
+    count: int,
+    seed: Optional[int] = None,
+    table: Optional[DistanceTable] = None,
+) -> Iterator[Instance]:
+    """Yields random solvable instances with an optimal depth in range
+
+    Every depth in the range is equally likely, and every board within a depth.
+
+    Args:
+        goal (State): Goal board shared by all instances
+        depths (int or tuple): Exact optimal depth, or an inclusive range
+        count (int): Number of instances
+        seed (int): Seed for the random generator
+        table (DistanceTable): Reused if given, else built up to the highest depth
+
+    Raises:
+        ValueError: If no board lies in the depth range, or the range is too
+            deep to tabulate, see `DistanceTable`
+    """
+    lowest, highest = depth_range(depths)
+    if table is None:
+        table = DistanceTable(goal, highest)
+
+    available = list(range(lowest, min(highest, table.max_depth) + 1))
+    if not available:
+        raise ValueError(f"No boards between depths {lowest} and {highest}")
+
+    rng = random.Random(seed)
+    for _ in range(count):
+        depth = rng.choice(available)
+        key = rng.choice(table.layers[depth])
+        yield Instance(State.from_key(key, goal.width, goal.height), goal, depth)
+
+
+def random_walk(goal: State, steps: int, rng: random.Random) -> State:
+    """Moves the empty tile randomly without stepping straight back
+
+    Works on any board size, but the result is only at most `steps` deep.
+
+    Returns:
+        State: solvable board
+    """
+    state = goal
+    previous = None
+    for _ in range(steps):
+        keys = [key for key, _, _ in state.successors() if key != previous]
+        previous = state.key()
+        state = State.from_key(rng.choice(keys), goal.width, goal.height)
+    return state
+
+
+def walks(
+    goal: State,
+    steps: Union[int, Tuple[int, int]],
+    count: int,
+    seed: Optional[int] = None,
+) -> Iterator[Instance]:
+    """Yields random walks out of the goal, labelled with their optimal depth
+
+    Works on any board size, unlike `generate`, but the depths only follow from
+    the walk lengths and every instance costs an A* search.
+
+    Args:
+        goal (State): Goal board shared by all instances
+        steps (int or tuple): Exact walk length, or an inclusive range
+        count (int): Number of instances
+        seed (int): Seed for the random generator
+    """
+    lowest, highest = depth_range(steps)
+    rng = random.Random(seed)
+    for _ in range(count):
+        start = random_walk(goal, rng.randint(lowest, highest), rng)
+        solver = OptimalSearchSolver(start, goal)
+        solver.run()
+        yield Instance(start, goal, solver.depth)
+
+
+def is_jsonl(path: str) -> bool:
+    """Picks the corpus format from the file name"""
+    return str(path).endswith(".jsonl")
+
+
+def write_corpus(path: str, instances: Iterable[Instance]) -> int:
+    """Streams instances into a corpus file
+
+    Returns:
+        int: number of instances written
+    """
+    written = 0
+    if is_jsonl(path):
+        with open(path, "w") as corpus:
+            for start, goal, depth in instances:
+                corpus.write(
+                    json.dumps({"start": start.tile_seq, "goal": goal.tile_seq, "depth": depth})
+                    + "\n"
+                )
+                written += 1
+        return written
+
+    with open(path, "wb") as corpus:
+        corpus.write(CORPUS_MAGIC)
+        for start, goal, depth in instances:
+            corpus.write(RECORD.pack(start.key(), goal.key(), goal.width, goal.height, depth))
+            written += 1
+    return written
+
+
+def read_corpus(path: str) -> Iterator[Instance]:
+    """Streams instances out of a corpus file
+
+    Raises:
+        ValueError: If a binary corpus has a bad header or a truncated record
+    """
+    if is_jsonl(path):
+        with open(path) as corpus:
+            for line in corpus:
+                if line.strip():
+                    record = json.loads(line)
+                    yield Instance(State(record["start"]), State(record["goal"]), record["depth"])
+        return
+
+    with open(path, "rb") as corpus:
+        if corpus.read(len(CORPUS_MAGIC)) != CORPUS_MAGIC:
+            raise ValueError(f"{path} is not a puzzle corpus")
+        if corpus.seek(0, 2) == len(CORPUS_MAGIC):
+            return
+
+        with mmap.mmap(corpus.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if (len(mapped) - len(CORPUS_MAGIC)) % RECORD.size:
+                raise ValueError(f"{path} ends with a truncated record")
+
+            for offset in range(len(CORPUS_MAGIC), len(mapped), RECORD.size):
+                start, goal, width, height, depth = RECORD.unpack_from(mapped, offset)
+                yield Instance(
+                    State.from_key(start, width, height),
+                    State.from_key(goal, width, height),
+                    depth,
+                )
+
+
+def map_corpus(path: str):
+    """Memory maps a binary corpus as a NumPy structured array, for batch work
+
+    Returns:
+        np.memmap: records with `start`, `goal`, `width`, `height` and `depth` fields
+    """
+    import numpy as np
+
+    dtype = np.dtype(
+        [
+            ("start", "<u8"),
+            ("goal", "<u8"),
+            ("width", "u1"),
+            ("height", "u1"),
+            ("depth", "<u2"),
+        ]
+    )
+    with open(path, "rb") as corpus:
+        if corpus.read(len(CORPUS_MAGIC)) != CORPUS_MAGIC:
+            raise ValueError(f"{path} is not a puzzle corpus")
+        if corpus.seek(0, 2) == len(CORPUS_MAGIC):
+            return np.zeros(0, dtype=dtype)
+
+    return np.memmap(path, dtype=dtype, mode="r", offset=len(CORPUS_MAGIC))
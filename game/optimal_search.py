@@ -0,0 +1,147 @@
+from .state import State, DIRECTIONS, TILE_BITS, TILE_MASK
+from .transposition import NO_MOVE, TranspositionTable
+from heapq import heappush, heappop
+from typing import List, Tuple
+
+"""
+This class implements the A* algorithm with the Manhattan distance heuristic.
+
+The Manhattan distance of the tiles, leaving out the empty tile, never
+overestimates the number of moves left and changes by exactly one per move,
+so the first time a board is taken off the OPEN list it has been reached by a
+shortest path. That makes this solver the reference for the optimal solution
+length of an instance.
+
+The OPEN list is a heap of (f(n), -g(n), order, board, h(n)) entries, which
+prefers deeper boards among equal f(n). A board is pushed again when a shorter
+path to it turns up, and the stale entries are skipped when popped.
+"""
+
+
+class OptimalSearchSolver:
+    """Implements A* to find a shortest solution"""
+
+    opened: List[Tuple[int, int, int, int, int]]
+    best_depths: TranspositionTable
+    closed: TranspositionTable
+    depth = 0
+
+    def __init__(self, current: State, target: State, expected: int = 1024):
+        """Creates the solver.
+
+        Args:
+            current (State): Initial State
+            target (State): Target State
+            expected (int): Number of boards to preallocate lookup tables for
+        """
+        self.current_state = current
+        self.target_state = target
+        self.target_key = target.key()
+        self.best_depths = TranspositionTable(expected)
+        self.closed = TranspositionTable(expected)
+        self.opened = []
+        self.pushed = 0
+
+        if not self.is_solvable():
+            raise RuntimeError("Unsolvable")
+
+        width = target.width
+        self.goals = [(0, 0)] * (width * target.height)
+        for index, item in enumerate(target.tiles()):
+            self.goals[item] = divmod(index, width)
+
+        self.push(current.key(), current.depth, self.manhattan(current), current.move_code())
+
+    def distance(self, item: int, index: int) -> int:
+        """Counts the moves a tile at `index` is away from its goal"""
+        row, col = divmod(index, self.target_state.width)
+        goal_row, goal_col = self.goals[item]
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    def manhattan(self, state: State) -> int:
+        """Sums the distances of the tiles to their goals, leaving out the empty tile
+
+        Returns:
+            int: lower bound on the moves left
+        """
+        return sum(
+            self.distance(item, index)
+            for index, item in enumerate(state.tiles())
+            if item != 0
+        )
+
+    def push(self, key: int, depth: int, estimate: int, move: int):
+        """Adds a board to the open list, ordered by depth + estimate"""
+        self.best_depths.add(key, depth, move)
+        heappush(self.opened, (depth + estimate, -depth, self.pushed, key, estimate))
+        self.pushed += 1
+
+    def next_state(self):
+        """Expands the most promising board on the open list"""
+        if self.is_solved():
+            raise StopIteration
+
+        while True:
+            _, negative_depth, _, key, estimate = heappop(self.opened)
+            depth, move = self.best_depths.get(key)
+            if key not in self.closed and depth == -negative_depth:
+                break
+
+        self.closed.add(key, depth, move)
+        observed_state = State.from_key(
+            key,
+            self.target_state.width,
+            self.target_state.height,
+            depth,
+            depth + estimate,
+            None if move == NO_MOVE else DIRECTIONS[move],
+        )
+        self.current_state = observed_state
+        self.depth = depth
+
+        # Only the tile that slid into the empty spot changes its distance
+        blank = observed_state.blank()
+        for child, target, direction in observed_state.successors():
+            if child in self.closed:
+                continue
+            if child in self.best_depths and self.best_depths.get(child)[0] <= depth + 1:
+                continue
+
+            item = (child >> (TILE_BITS * blank)) & TILE_MASK
+            child_estimate = (
+                estimate - self.distance(item, target) + self.distance(item, blank)
+            )
+            self.push(child, depth + 1, child_estimate, DIRECTIONS.index(direction))
+
+    def is_solved(self) -> bool:
+        """Checks if the search has found a solution
+
+        Returns:
+            bool: is puzzle solved
+        """
+        return self.current_state.key() == self.target_key
+
+    def is_solvable(self) -> bool:
+        """Detects if the current puzzle has a solution
+
+        Returns:
+            bool: if the puzzle is solvable
+        """
+        return self.current_state.is_reachable(self.target_state)
+
+    def path(self) -> List[str]:
+        """Moves from the initial state to the current state
+
+        Returns:
+            List[str]: moves of the empty tile, in order
+        """
+        return self.current_state.path(self.closed)
+
+    def run(self) -> int:
+        """Runs the search"""
+        iterations = 0
+        while not self.is_solved():
+            self.next_state()
+            iterations += 1
+
+        return iterations
@@ -0,0 +1,226 @@
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import List, Optional
+from .transposition import TranspositionTable
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+"""
+Memory instrumentation for the solvers.
+
+`MemoryProfiler` steps a solver and, every few expansions, counts the bytes held
+by each of its structures:
+
+* frontier - the OPEN container itself (deque, list or heap)
+* index - the lookup kept next to OPEN (`opened_keys` or `best_depths`)
+* closed - the CLOSED transposition table
+* arena - the nodes held by the frontier: `State` objects or heap entries, and
+  the integers they own
+
+The counts come from `sys.getsizeof` and are exact for the objects counted, but
+leave out allocator overhead. Sampled `tracemalloc` snapshots and the process
+RSS are recorded next to them to show what the counts miss.
+"""
+
+# Lookups that solvers keep next to their OPEN container
+INDEX_ATTRIBUTES = ("opened_keys", "best_depths")
+
+# CPython caches these, so no node owns them
+SMALL_INTS = range(-5, 257)
+
+
+def owned_bytes(item: object) -> int:
+    """Counts the bytes of a node and of the values only it refers to
+
+    Shared values (small integers, strings, None, booleans) are left out.
+    Attributes are read through `__slots__`, because reading `__dict__` makes
+    CPython build a dictionary the object did not have before.
+
+    Returns:
+        int: bytes owned by the node
+    """
+    if item is None or isinstance(item, (bool, str)):
+        return 0
+    if isinstance(item, int):
+        return 0 if item in SMALL_INTS else sys.getsizeof(item)
+    if isinstance(item, tuple):
+        return sys.getsizeof(item) + sum(owned_bytes(value) for value in item)
+
+    size = sys.getsizeof(item)
+    for cls in type(item).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            size += owned_bytes(getattr(item, name, None))
+    return size
+
+
+def structure_bytes(structure: object) -> int:
+    """Counts the bytes of a container, leaving out the nodes it holds
+
+    Returns:
+        int: bytes used by the container
+    """
+    if isinstance(structure, TranspositionTable):
+        return sys.getsizeof(structure) + sum(
+            sys.getsizeof(storage)
+            for storage in (structure.keys, structure.depths, structure.moves)
+        )
+    return sys.getsizeof(structure)
+
+
+def current_rss() -> Optional[int]:
+    """Reads the resident set size of this process, where the OS exposes it
+
+    Returns:
+        int: bytes resident in memory, or None
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss() -> Optional[int]:
+    """Reads the highest resident set size of this process so far
+
+    Returns:
+        int: bytes, or None where the OS does not report it
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryProfiler:
+    """Steps a solver to the solution while sampling its memory"""
+
+    def __init__(self, solver, every: int = 100, snapshot_every: int = 10, trace: bool = True):
+        """Wraps a solver that has not been run yet.
+
+        Args:
+            solver: Any of the solvers in `game`
+            every (int): Expansions between samples
+            snapshot_every (int): Samples between `tracemalloc` snapshots
+            trace (bool): Whether to trace allocations, which slows the search down
+        """
+        self.solver = solver
+        self.every = every
+        self.snapshot_every = snapshot_every
+        self.trace = trace
+        self.samples: List[dict] = []
+        self.snapshots: List[dict] = []
+
+    def index(self):
+        """Finds the lookup the solver keeps next to its OPEN container"""
+        for attribute in INDEX_ATTRIBUTES:
+            if hasattr(self.solver, attribute):
+                return getattr(self.solver, attribute)
+        return None
+
+    def sample(self, iterations: int, elapsed: float):
+        """Records the bytes held by every structure of the solver"""
+        solver = self.solver
+        index = self.index()
+
+        sample = {
+            "iterations": iterations,
+            "time": elapsed,
+            "frontier_entries": len(solver.opened),
+            "closed_entries": len(solver.closed),
+            "frontier_bytes": structure_bytes(solver.opened),
+            "index_bytes": 0 if index is None else structure_bytes(index),
+            "closed_bytes": structure_bytes(solver.closed),
+            "arena_bytes": sum(owned_bytes(node) for node in solver.opened),
+            "traced_bytes": None,
+            "traced_peak": None,
+            "rss": current_rss(),
+            "peak_rss": peak_rss(),
+        }
+        if self.trace:
+            sample["traced_bytes"], sample["traced_peak"] = tracemalloc.get_traced_memory()
+        self.samples.append(sample)
+
+        if self.trace and len(self.samples) % self.snapshot_every == 1:
+            self.snapshot(iterations)
+
+    def snapshot(self, iterations: int, limit: int = 10):
+        """Records the source lines holding the most traced memory"""
+        statistics = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        ).statistics("lineno")
+
+        self.snapshots.append(
+            {
+                "iterations": iterations,
+                "top": [
+                    {
+                        "where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        "bytes": stat.size,
+                        "blocks": stat.count,
+                    }
+                    for stat in statistics[:limit]
+                ],
+            }
+        )
+
+    def run(self) -> int:
+        """Runs the solver to the solution
+
+        Returns:
+            int: number of expanded states
+        """
+        if self.trace:
+            tracemalloc.start()
+
+        iterations = 0
+        began = time.perf_counter()
+        try:
+            self.sample(iterations, 0.0)
+            while not self.solver.is_solved():
+                self.solver.next_state()
+                iterations += 1
+                if iterations % self.every == 0:
+                    self.sample(iterations, time.perf_counter() - began)
+
+            if iterations % self.every:
+                self.sample(iterations, time.perf_counter() - began)
+        finally:
+            if self.trace:
+                tracemalloc.stop()
+
+        return iterations
+
+    def peaks(self) -> dict:
+        """Highest value of every sampled column"""
+        return {
+            column: max(
+                (sample[column] for sample in self.samples if sample[column] is not None),
+                default=None,
+            )
+            for column in self.samples[0]
+            if column not in ("iterations", "time")
+        }
+
+    def export(self, path: str):
+        """Writes the samples as CSV, or samples and snapshots as JSON for `.json` paths"""
+        if path.endswith(".json"):
+            with open(path, "w") as output:
+                json.dump({"samples": self.samples, "snapshots": self.snapshots}, output, indent=1)
+            return
+
+        with open(path, "w", newline="") as output:
+            writer = csv.DictWriter(output, fieldnames=list(self.samples[0]))
+            writer.writeheader()
+            writer.writerows(self.samples)
@@ -0,0 +1,278 @@
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from .solvers import SOLVERS, TIME_LIMIT, run_solver
+
+"""
+Asyncio front end for the solvers.
+
+Solver runs are CPU bound, so they are handed off to a process pool and never
+run on the event loop. Concurrent requests for the same (start, goal, mode)
+share a single in-flight solve, and a bounded queue sits in front of the pool
+so that callers wait instead of piling up unbounded work.
+
+Every solve gets a time limit (see `run_solver`), so a hopeless request (say a
+breadth-first search of a 4x4 board) cannot hold a worker forever. If a worker
+dies anyway, for example when it runs out of memory, the broken pool is replaced.
+"""
+
+Board = Tuple[Tuple[int, ...], ...]
+ProblemKey = Tuple[Board, Board, str]
+
+
+def to_board(tiles: Sequence[Sequence[int]]) -> Board:
+    """Converts nested tile rows into a hashable board
+
+    Raises:
+        ValueError: If the tiles are not a non-empty grid holding 0, 1, ... once each
+    """
+    try:
+        board = tuple(tuple(int(tile) for tile in row) for row in tiles)
+    except TypeError:
+        raise ValueError("Board must be a list of rows")
+
+    if not board or any(len(row) != len(board[0]) for row in board):
+        raise ValueError("Board must be a non-empty rectangle")
+
+    if sorted(tile for row in board for tile in row) != list(range(len(board) * len(board[0]))):
+        raise ValueError("Board must hold the tiles 0 to width * height - 1 once each")
+
+    return board
+
+
+class SolveService:
+    """Coalesces and queues solve requests in front of a process pool"""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 64,
+        executor: Optional[Executor] = None,
+        time_limit: float = TIME_LIMIT,
+    ):
+        """Creates the service. Call `start` before submitting requests.
+
+        Args:
+            workers (int): Number of solves allowed to run at once
+            queue_size (int): Number of distinct solves allowed to wait
+            executor (Executor): Pool to run solves in, defaults to a process pool
+            time_limit (float): Seconds a single solve may run
+        """
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor = executor
+        self.time_limit = time_limit
+        self.in_flight: Dict[ProblemKey, asyncio.Future] = {}
+        self.waiters: Dict[ProblemKey, int] = {}
+        self.handoffs: Set[asyncio.Future] = set()
+        self.solves = 0
+
+    async def start(self):
+        """Creates the queue and the dispatcher tasks"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+
+        self.queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self.dispatchers = [
+            asyncio.ensure_future(self.dispatch()) for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Cancels the dispatchers and shuts the pool down"""
+        for task in self.dispatchers + list(self.handoffs):
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, *self.handoffs, return_exceptions=True)
+
+        # Waiting for busy workers would block the event loop until their solves end
+        workers = list((getattr(self.executor, "_processes", None) or {}).values())
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.terminate()
+
+    async def dispatch(self):
+        """Feeds queued problems into the pool, one at a time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            key, future = await self.queue.get()
+            executor = self.executor
+            try:
+                self.solves += 1
+                result = await loop.run_in_executor(executor, run_solver, *key, self.time_limit)
+                future.set_result(result)
+            except BrokenProcessPool as error:
+                # A worker died, so the pool refuses all work until it is replaced
+                if executor is self.executor:
+                    executor.shutdown(wait=False)
+                    self.executor = ProcessPoolExecutor(self.workers)
+                future.set_exception(error)
+            except Exception as error:
+                future.set_exception(error)
+            finally:
+                del self.in_flight[key]
+                self.queue.task_done()
+
+    async def solve(
+        self,
+        start: Sequence[Sequence[int]],
+        goal: Sequence[Sequence[int]],
+        mode: str = "informed",
+    ) -> dict:
+        """Solves a puzzle, sharing the work with identical in-flight requests
+
+        Raises:
+            ValueError: If the boards or the mode are malformed
+        """
+        if mode not in SOLVERS:
+            raise ValueError(f"Unknown mode: {mode}")
+
+        key = (to_board(start), to_board(goal), mode)
+        if len(key[0]) != len(key[1]) or len(key[0][0]) != len(key[1][0]):
+            raise ValueError("Start and goal boards must have the same shape")
+
+        future = self.in_flight.get(key)
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self.in_flight[key] = future
+                try:
+                    # Waits here while the queue is full
+                    await self.queue.put((key, future))
+                except BaseException:
+                    if self.waiters[key] > 1:
+                        # Others joined this solve, so queue it on their behalf
+                        self.hand_off(key, future)
+                    else:
+                        del self.in_flight[key]
+                        future.cancel()
+                    raise
+
+            # Shielded so a cancelled caller does not cancel the shared solve
+            return await asyncio.shield(future)
+        finally:
+            self.waiters[key] -= 1
+            if not self.waiters[key]:
+                del self.waiters[key]
+
+    def hand_off(self, key: ProblemKey, future: asyncio.Future):
+        """Queues a solve in the background after its first caller gave up waiting"""
+        handoff = asyncio.ensure_future(self.queue.put((key, future)))
+        self.handoffs.add(handoff)
+        handoff.add_done_callback(self.handoffs.discard)
+
+    async def solve_many(self, problems: List[dict]) -> List[dict]:
+        """Solves several puzzles concurrently
+
+        Returns:
+            List[dict]: results in the same order as `problems`
+        """
+        return await asyncio.gather(
+            *(
+                self.solve(
+                    problem["start"],
+                    problem["goal"],
+                    problem.get("mode", "informed"),
+                )
+                for problem in problems
+            )
+        )
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, dict, bytes]]:
+    """Reads one HTTP/1.1 request
+
+    Returns:
+        method, path, headers and body, or None if the client went away
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return method, path, headers, body
+
+
+def write_response(writer: asyncio.StreamWriter, status: str, payload: dict):
+    """Writes a JSON response"""
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+async def route(service: SolveService, method: str, path: str, body: bytes) -> Tuple[str, dict]:
+    """Maps a request to the service
+
+    Returns:
+        status line and JSON payload
+    """
+    if method != "POST" or path not in ("/solve", "/batch"):
+        return "404 Not Found", {"error": "Use POST /solve or POST /batch"}
+
+    try:
+        request = json.loads(body)
+        if path == "/solve":
+            return "200 OK", await service.solve(
+                request["start"], request["goal"], request.get("mode", "informed")
+            )
+        return "200 OK", {"results": await service.solve_many(request["problems"])}
+    except (ValueError, KeyError, TypeError) as error:
+        return "400 Bad Request", {"error": str(error)}
+    except Exception as error:
+        return "500 Internal Server Error", {"error": repr(error)}
+
+
+async def serve(
+    service: SolveService,
+    host: str = "127.0.0.1",
+    port: int = 8425,
+    path: Optional[str] = None,
+) -> asyncio.AbstractServer:
+    """Starts an HTTP server for the service on TCP or on a Unix socket
+
+    Endpoints:
+        POST /solve - {"start": [[...]], "goal": [[...]], "mode": "informed"}
+        POST /batch - {"problems": [...]}, results come back in request order
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+
+                method, route_path, headers, body = request
+                status, payload = await route(service, method, route_path, body)
+                write_response(writer, status, payload)
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # The server is shutting down while a solve is pending
+            pass
+        finally:
+            writer.close()
+
+    if path is not None:
+        return await asyncio.start_unix_server(handle, path)
+    return await asyncio.start_server(handle, host, port)
@@ -0,0 +1,58 @@
+import time
+from typing import Sequence
+from .informed_search import InformedSearchSolver
+from .optimal_search import OptimalSearchSolver
+from .state import State
+from .uninformed_search import UninformedSearchSolver
+
+"""
+The solvers by the mode names that the service and the scripts accept.
+
+Every solver takes (current, target, expected) and provides `next_state`,
+`is_solved`, `path` and `run`.
+
+`run_solver` is what the service's pool workers run. It lives here rather than
+in `game.service` so that the workers do not have to import asyncio.
+"""
+
+Board = Sequence[Sequence[int]]
+
+# Seconds a single solve may run before it is given up
+TIME_LIMIT = 10.0
+
+# Iterations between checks of the clock
+CHECK_EVERY = 1024
+
+SOLVERS = {
+    "uninformed": UninformedSearchSolver,
+    "informed": InformedSearchSolver,
+    "optimal": OptimalSearchSolver,
+}
+
+
+def run_solver(
+    start: Board, goal: Board, mode: str, time_limit: float = TIME_LIMIT
+) -> dict:
+    """Runs one solver to completion. Executed inside the worker processes.
+
+    Returns:
+        dict: iteration count, solution depth and moves of the empty tile, or an error message
+    """
+    try:
+        solver = SOLVERS[mode](State(start), State(goal))
+    except RuntimeError as error:
+        return {"error": str(error)}
+
+    deadline = time.monotonic() + time_limit
+    iterations = 0
+    while not solver.is_solved():
+        solver.next_state()
+        iterations += 1
+        if iterations % CHECK_EVERY == 0 and time.monotonic() > deadline:
+            return {"error": f"Time limit of {time_limit:g} s exceeded", "iterations": iterations}
+
+    return {
+        "iterations": iterations,
+        "depth": solver.current_state.depth,
+        "path": solver.path(),
+    }
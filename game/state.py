@@ -1,96 +1,190 @@
-import numpy as np
-from copy import deepcopy
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 from math import sqrt, floor
+from .transposition import NO_MOVE, TranspositionTable
+
+# Successors are generated in this order, matching `State.neighbors`
+DIRECTIONS = ("right", "left", "up", "down")
+
+# Undoing a move means moving the empty tile back the other way
+OPPOSITES = {"right": "left", "left": "right", "up": "down", "down": "up"}
+
+# Tiles are packed into an integer key, 4 bits per tile, first tile lowest
+TILE_BITS = 4
+TILE_MASK = (1 << TILE_BITS) - 1
+
+# Keys are stored as unsigned 64 bit integers by `TranspositionTable`
+MAX_TILES = 64 // TILE_BITS
 
 
 class State:
-    def __init__(self, tile_seq=[], depth=0, weight=0):
-        self.tile_seq = tile_seq
-        self.depth = depth
-        self.weight = weight
+    """A board stored as a packed integer, see `key`
 
-    def flatten(self) -> "np.ndarray[np.float64]":
-        """Flattens the nested array structure into a one dimensional array
+    Every tile takes 4 bits and a key has to fit in 64 bits, so boards hold at
+    most 16 tiles numbered 0 to 15, up to the 4x4 puzzle.
 
-        Returns:
-            Flattened array
+    NumPy is not needed to use a state. Only `flatten` imports it, on demand.
+    """
+
+    __slots__ = ("height", "width", "depth", "weight", "direction", "_key", "_blank")
+
+    def __init__(self, tile_seq=[], depth=0, weight=0, direction=None):
+        """Packs the rows of a board.
+
+        Raises:
+            ValueError: If the board has more than 16 tiles or a tile outside 0 to 15
         """
+        rows = [[int(item) for item in row] for row in tile_seq]
 
-        tiles = np.zeros(len(self.tile_seq) * len(self.tile_seq[0]))
-        index = 0
-        for row in self.tile_seq:
-            for item in row:
-                tiles[index] = item
-                index += 1
-        return tiles
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        self.depth = depth
+        self.weight = weight
+        self.direction = direction
 
-    def move(self, direction: str) -> "State":
-        """ Moves the empty tile in the given direction
+        tiles = [item for row in rows for item in row]
+        if len(tiles) > MAX_TILES:
+            raise ValueError(f"Boards hold at most {MAX_TILES} tiles, got {len(tiles)}")
+        if any(not 0 <= item <= TILE_MASK for item in tiles):
+            raise ValueError(f"Tiles must be between 0 and {TILE_MASK}")
+
+        self._key = 0
+        for index, item in enumerate(tiles):
+            self._key |= item << (TILE_BITS * index)
+        self._blank = None
+
+    @classmethod
+    def from_key(
+        cls, key: int, width: int, height: int, depth=0, weight=0, direction=None, blank=None
+    ) -> "State":
+        """Builds a state straight from a packed board
 
         Args:
-            direction: `str` - "up", "right", "down" or "left"
+            blank: `int` - index of the empty tile, found on first use if None
 
         Returns:
-            All possible states after the move is done.
-        Raises:
-            IndexError: If the move is unsupported
+            State: state holding the packed board
         """
+        state = cls.__new__(cls)
+        state.height = height
+        state.width = width
+        state.depth = depth
+        state.weight = weight
+        state.direction = direction
+        state._key = key
+        state._blank = blank
+        return state
+
+    @property
+    def tile_seq(self) -> Tuple[Tuple[int, ...], ...]:
+        """Unpacks the board into rows of tiles"""
+        tiles = self.tiles()
+        return tuple(
+            tuple(tiles[row * self.width : (row + 1) * self.width])
+            for row in range(self.height)
+        )
+
+    def tiles(self) -> List[int]:
+        """Unpacks the board into a flat list of tiles, row by row
 
-        new_state = State(deepcopy(self.tile_seq), self.depth + 1, self.weight)
+        Returns:
+            List[int]: tiles
+        """
+        key = self._key
+        return [
+            (key >> (TILE_BITS * index)) & TILE_MASK
+            for index in range(self.width * self.height)
+        ]
 
-        coordinates = np.argwhere(new_state.tile_seq == 0).flatten()
-        current_x, current_y = coordinates[1], coordinates[0]
+    def key(self) -> int:
+        """Packed integer that identifies the board
 
-        if direction == "up":
-            if current_y == 0:
-                raise IndexError
+        Returns:
+            int: packed board
+        """
+        return self._key
 
-            target_x = current_x
-            target_y = current_y - 1
+    def blank(self) -> int:
+        """Finds the empty tile, unpacking the board only if it is not known yet
 
-            new_state.tile_seq[current_y][current_x] = new_state.tile_seq[target_y][
-                target_x
-            ]
-            new_state.tile_seq[target_y][target_x] = 0
+        Returns:
+            int: index of the empty tile, row by row
+        """
+        if self._blank is None:
+            self._blank = self.tiles().index(0)
+        return self._blank
 
-        elif direction == "right":
-            if current_x == 3:
-                raise IndexError
+    def successors(self) -> Iterator[Tuple[int, int, str]]:
+        """Lazily computes the boards reachable in one move, without building states
 
-            target_x = current_x + 1
-            target_y = current_y
+        Yields:
+            Tuple[int, int, str]: packed board, index of the empty tile and the move
+        """
+        key = self._key
+        width = self.width
+        blank = self.blank()
+        y, x = divmod(blank, width)
+
+        for direction, allowed, offset in (
+            ("right", x < width - 1, 1),
+            ("left", x > 0, -1),
+            ("up", y > 0, -width),
+            ("down", y < self.height - 1, width),
+        ):
+            if allowed:
+                target = blank + offset
+                tile = (key >> (TILE_BITS * target)) & TILE_MASK
+                yield (
+                    key - (tile << (TILE_BITS * target)) + (tile << (TILE_BITS * blank)),
+                    target,
+                    direction,
+                )
+
+    def expand(
+        self, key: int, direction: Optional[str] = None, blank: Optional[int] = None
+    ) -> "State":
+        """Builds the successor state for a key produced by `successors`
 
-            new_state.tile_seq[current_y][current_x] = new_state.tile_seq[target_y][
-                target_x
-            ]
-            new_state.tile_seq[target_y][target_x] = 0
+        Args:
+            key: `int` - packed board of the child
+            direction: `str` - move that produced the child, if known
+            blank: `int` - index of the empty tile in the child, if known
 
-        elif direction == "down":
-            if current_y == 3:
-                raise IndexError
+        Returns:
+            State: the child, one level deeper
+        """
+        return State.from_key(
+            key, self.width, self.height, self.depth + 1, self.weight, direction, blank
+        )
 
-            target_x = current_x
-            target_y = current_y + 1
+    def flatten(self) -> "np.ndarray[np.float64]":
+        """Flattens the nested array structure into a one dimensional array
 
-            new_state.tile_seq[current_y][current_x] = new_state.tile_seq[target_y][
-                target_x
-            ]
-            new_state.tile_seq[target_y][target_x] = 0
+        Returns:
+            Flattened array
+        """
+        import numpy as np
 
-        elif direction == "left":
-            if current_x == 0:
-                raise IndexError
+        return np.array(self.tiles(), dtype=np.float64)
 
-            target_x = current_x - 1
-            target_y = current_y
+    def move(self, direction: str) -> "State":
+        """ Moves the empty tile in the given direction
 
-            new_state.tile_seq[current_y][current_x] = new_state.tile_seq[target_y][
-                target_x
-            ]
-            new_state.tile_seq[target_y][target_x] = 0
+        Args:
+            direction: `str` - "up", "right", "down" or "left"
 
-        return new_state
+        Returns:
+            All possible states after the move is done.
+        Raises:
+            IndexError: If the move is unsupported
+        """
+        for key, blank, candidate in self.successors():
+            if candidate == direction:
+                return self.expand(key, direction, blank)
+
+        if direction in DIRECTIONS:
+            raise IndexError
+
+        return self.expand(self._key, direction, self._blank)
 
     def neighbors(self) -> List["State"]:
         """Computes all future states possible from current situation
@@ -98,40 +192,21 @@ class State:
         Returns:
             List[State]: All possible states
         """
-        neighbors = list()
-
-        try:
-            neighbors.append(self.move("right"))
-        except IndexError:
-            pass
-
-        try:
-            neighbors.append(self.move("left"))
-        except IndexError:
-            pass
-
-        try:
-            neighbors.append(self.move("up"))
-        except IndexError:
-            pass
-
-        try:
-            neighbors.append(self.move("down"))
-        except IndexError:
-            pass
-
-        return neighbors
+        return [
+            self.expand(key, direction, blank)
+            for key, blank, direction in self.successors()
+        ]
 
     def heuristic_score(self, target_state: "State", current_depth: int) -> int:
         """Sets the weight to the heuristic value
-        
+
         Solve the game using heuristic search strategies
-        
+
         * There are three types of heuristic rules:
         * (1) Tiles out of place
         * (2) Sum of distances out of place
         * (3) 2 x the number of direct tile reversals
-        
+
         * evaluation function
         * f(n) = g(n) + h(n)
         * g(n) = depth of path length to start state
@@ -151,43 +226,47 @@ class State:
         Returns:
             int: misplaced tile count
         """
-        return np.sum(self.tile_seq != target_state.tile_seq)
+        return sum(
+            item != goal for item, goal in zip(self.tiles(), target_state.tiles())
+        )
 
-    def misplaced_distances(self, target_state: "State") -> int:
-        """ Calculates Manhattan distance 
-        
-        Returns:
-            int: misplaced distances
+    def offsets(self, target_state: "State") -> Iterator[Tuple[int, int]]:
+        """Pairs every tile with how far it is from its place in the target
+
+        Tiles are visited column by column.
+
+        Yields:
+            Tuple[int, int]: row and column offsets of a tile
         """
-        distance = 0
+        width = self.width
+        tiles = self.tiles()
+        goals = {item: divmod(index, width) for index, item in enumerate(target_state.tiles())}
 
-        current_tiles = self.tile_seq
-        target_tiles = target_state.tile_seq
+        for col in range(width):
+            for row in range(self.height):
+                goal = goals.get(tiles[row * width + col])
+                if goal is not None:
+                    yield row - goal[0], col - goal[1]
 
-        for current_x, current_y in np.ndindex(current_tiles.shape):
-            for goal_x, goal_y in np.ndindex(target_tiles.shape):
-                if self[current_y][current_x] == target_state[goal_y][goal_x]:
-                    distance += abs(current_y - goal_y) + abs(current_x - goal_x)
+    def misplaced_distances(self, target_state: "State") -> int:
+        """ Calculates Manhattan distance
 
-        return distance
+        Returns:
+            int: misplaced distances
+        """
+        return sum(abs(rows) + abs(cols) for rows, cols in self.offsets(target_state))
 
     def euclidean_distance(self, target_state: "State") -> int:
-        """ Calculates Euclidean distance 
-        
+        """ Calculates Euclidean distance
+
         Returns:
             int: misplaced distances
         """
         distance = 0
 
-        current_tiles = self.tile_seq
-        target_tiles = target_state.tile_seq
+        for rows, cols in self.offsets(target_state):
+            distance += sqrt(pow(rows, 2) + pow(cols, 2))
 
-        for current_x, current_y in np.ndindex(current_tiles.shape):
-            for goal_x, goal_y in np.ndindex(target_tiles.shape):
-                if self[current_y][current_x] == target_state[goal_y][goal_x]:
-                    distance += sqrt(
-                        pow(current_y - goal_y, 2) + pow(current_x - goal_x, 2)
-                    )
         return floor(distance)
 
     def tile_reversals(self, target_state: "State") -> int:
@@ -198,34 +277,115 @@ class State:
         """
         reversals = 0
 
-        current_tiles = self.tile_seq
-        for row, col in np.ndindex(current_tiles.shape):
-            if row != 2:
-                if self[row][col] == target_state[row + 1][col]:
+        width = self.width
+        tiles = self.tiles()
+        goals = target_state.tiles()
+        for index, item in enumerate(tiles):
+            row, col = divmod(index, width)
+            if row != self.height - 1:
+                if item == goals[index + width]:
                     reversals += 1
-            if col != 2:
-                if self[row][col] == target_state[row][col + 1]:
+            if col != width - 1:
+                if item == goals[index + 1]:
                     reversals += 1
 
         return reversals
 
-    def __getitem__(self, index: int) -> List[int]:
+    def inversions(self) -> int:
+        """Counts pairs of tiles that are in the opposite order of 1, 2, 3, ...
+
+        Returns:
+            int: inversion count, ignoring the empty tile
+        """
+        tiles = [item for item in self.tiles() if item != 0]
+
+        return sum(
+            1
+            for index, item in enumerate(tiles)
+            for later in tiles[index + 1 :]
+            if item > later
+        )
+
+    def is_reachable(self, target_state: "State") -> bool:
+        """Checks if the target can be reached by sliding tiles
+
+        Every move keeps the parity of the inversion count, plus the row of the
+        empty tile when the board width is even, so both states must agree on it.
+
+        Returns:
+            bool: if the target state is reachable
+        """
+        def invariant(state: "State") -> int:
+            parity = state.inversions()
+            if state.width % 2 == 0:
+                parity += state.blank() // state.width
+            return parity % 2
+
+        return invariant(self) == invariant(target_state)
+
+    def move_code(self) -> int:
+        """Encodes the move that produced this state as a small integer
+
+        Returns:
+            int: index into `DIRECTIONS`, or `NO_MOVE` for a starting state
+        """
+        if self.direction is None:
+            return NO_MOVE
+        return DIRECTIONS.index(self.direction)
+
+    def path(self, closed: TranspositionTable) -> List[str]:
+        """Retraces the moves from the start state to this state
+
+        Follows the moves recorded in a solver's closed table, starting with
+        the move that produced this state.
+
+        Returns:
+            List[str]: moves of the empty tile, in order
+        Raises:
+            RuntimeError: If the recorded moves do not lead back to a start state
+        """
+        moves = []
+        state = self
+        direction = self.direction
+
+        while direction is not None:
+            if len(moves) > len(closed):
+                raise RuntimeError("Recorded moves form a cycle")
+
+            moves.append(direction)
+            state = state.move(OPPOSITES[direction])
+            try:
+                code = closed.get(state.key())[1]
+            except KeyError:
+                raise RuntimeError("Recorded moves lead to an unexplored state")
+            direction = None if code == NO_MOVE else DIRECTIONS[code]
+
+        moves.reverse()
+        return moves
+
+    def __getitem__(self, index: int) -> Tuple[int, ...]:
         return self.tile_seq[index]
 
     def __eq__(self, obj: object) -> bool:
         if not isinstance(obj, self.__class__):
             return False
 
-        return bool(np.all(self.tile_seq == obj.tile_seq))
+        return self._key == obj._key
 
     def __ne__(self, obj: object) -> bool:
         return not self == obj
 
     def __hash__(self) -> int:
-        return hash((np.array2string(self.tile_seq)))
+        return hash(self._key)
 
     def __str__(self):
-        return np.array2string(self.tile_seq)
+        # Same layout as printing the board as a NumPy array
+        size = max((len(str(item)) for item in self.tiles()), default=0)
+        rows = (
+            "[" + " ".join(str(item).rjust(size) for item in row) + "]"
+            for row in self.tile_seq
+        )
+        return "[" + "\n ".join(rows) + "]"
 
     def __repr__(self):
         return self.tile_seq.__repr__()
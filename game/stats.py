@@ -0,0 +1,15 @@
+from typing import List
+
+"""
+Summary statistics shared by the benchmark scripts.
+"""
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Picks the value that a fraction of the values are below, by nearest rank
+
+    Returns:
+        float: percentile of a non-empty list
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
@@ -0,0 +1,166 @@
+from array import array
+from typing import Iterator, Tuple
+
+"""
+Compact set of visited boards for the solvers.
+
+Boards are stored as packed integer keys (see `State.key`) in an open addressed
+hash table with linear probing. Keys, depths and moves live in parallel typed
+arrays (uint64, uint8, uint8), so an entry costs 10 bytes of payload instead of
+a Python object per board. A key of 0 marks an empty slot. Every board with two
+or more tiles holds a non-zero tile, so only the 1x1 board packs to 0, and the
+table refuses it.
+"""
+
+EMPTY = 0
+NO_MOVE = 0xFF
+MAX_DEPTH = 0xFF
+
+# Fibonacci hashing spreads the packed boards, whose low bits vary very little
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+MASK_64 = (1 << 64) - 1
+
+
+class TranspositionTable:
+    """Open addressed hash table from packed boards to depth and move"""
+
+    def __init__(self, expected: int = 1024, max_load: float = 0.5):
+        """Preallocates room for the expected number of boards.
+
+        Args:
+            expected (int): Number of boards to hold before the first rehash
+            max_load (float): Fraction of slots allowed to be used
+        """
+        self.max_load = max_load
+        self.size = 0
+
+        capacity = 8
+        while capacity * max_load < expected:
+            capacity *= 2
+        self.allocate(capacity)
+
+    def allocate(self, capacity: int):
+        """Replaces the storage with empty arrays of the given capacity"""
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.shift = 64 - capacity.bit_length() + 1
+        self.keys = array("Q", [EMPTY]) * capacity
+        self.depths = array("B", [0]) * capacity
+        self.moves = array("B", [NO_MOVE]) * capacity
+
+    def home(self, key: int) -> int:
+        """Computes the preferred slot of a key"""
+        return ((key * HASH_MULTIPLIER) & MASK_64) >> self.shift
+
+    def slot(self, key: int) -> int:
+        """Finds the slot holding the key, or the empty slot where it would go"""
+        keys = self.keys
+        index = self.home(key)
+        while True:
+            stored = keys[index]
+            if stored == key or stored == EMPTY:
+                return index
+            index = (index + 1) & self.mask
+
+    def grow(self):
+        """Doubles the capacity and rehashes every entry"""
+        entries = zip(self.keys, self.depths, self.moves)
+
+        self.allocate(self.capacity * 2)
+        for key, depth, move in entries:
+            if key == EMPTY:
+                continue
+            index = self.slot(key)
+            self.keys[index] = key
+            self.depths[index] = depth
+            self.moves[index] = move
+
+    def add(self, key: int, depth: int = 0, move: int = NO_MOVE):
+        """Stores a board, overwriting the depth and move if already present
+
+        Raises:
+            ValueError: If the key is the `EMPTY` marker
+            OverflowError: If the depth does not fit in a byte
+        """
+        if key == EMPTY:
+            raise ValueError(f"Key {EMPTY} marks an empty slot and cannot be stored")
+        if depth > MAX_DEPTH:
+            raise OverflowError(f"Depth {depth} does not fit in the table")
+
+        index = self.slot(key)
+        if self.keys[index] == EMPTY:
+            if (self.size + 1) > self.capacity * self.max_load:
+                self.grow()
+                index = self.slot(key)
+            self.keys[index] = key
+            self.size += 1
+
+        self.depths[index] = depth
+        self.moves[index] = move
+
+    def get(self, key: int) -> Tuple[int, int]:
+        """Looks up a board
+
+        Returns:
+            Tuple[int, int]: depth and move stored with the board
+        Raises:
+            KeyError: If the board is not in the table
+        """
+        index = self.slot(key)
+        if self.keys[index] == EMPTY:
+            raise KeyError(key)
+        return self.depths[index], self.moves[index]
+
+    def remove(self, key: int):
+        """Deletes a board, shifting later entries back so no tombstones are left
+
+        Raises:
+            KeyError: If the board is not in the table
+        """
+        keys = self.keys
+        hole = self.slot(key)
+        if keys[hole] == EMPTY:
+            raise KeyError(key)
+
+        index = hole
+        while True:
+            index = (index + 1) & self.mask
+            stored = keys[index]
+            if stored == EMPTY:
+                break
+
+            # Entries whose home lies cyclically in (hole, index] must stay put
+            home = self.home(stored)
+            if hole <= index:
+                stays = hole < home <= index
+            else:
+                stays = home > hole or home <= index
+            if stays:
+                continue
+
+            keys[hole] = keys[index]
+            self.depths[hole] = self.depths[index]
+            self.moves[hole] = self.moves[index]
+            hole = index
+
+        keys[hole] = EMPTY
+        self.depths[hole] = 0
+        self.moves[hole] = NO_MOVE
+        self.size -= 1
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the table storage"""
+        return sum(
+            len(storage) * storage.itemsize
+            for storage in (self.keys, self.depths, self.moves)
+        )
+
+    def __contains__(self, key: int) -> bool:
+        return self.keys[self.slot(key)] != EMPTY
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        return (key for key in self.keys if key != EMPTY)
@@ -1,32 +1,38 @@
 from .state import State
+from .transposition import TranspositionTable
 from collections import deque
-import numpy as np
-import sys
-from typing import Set
+from typing import List
 
 
 class UninformedSearchSolver:
     """Implements BFS to find a solution to an 8-puzzle problem"""
 
-    opened: deque = deque()
-    closed: Set[State] = set()
+    opened: deque
+    opened_keys: TranspositionTable
+    closed: TranspositionTable
     depth = 0
 
-    def __init__(self, current: State, target: State):
+    def __init__(self, current: State, target: State, expected: int = 1024):
         """Creates State object.
 
         Args:
             current (State): Initial State
             target (State): Target State
+            expected (int): Number of boards to preallocate lookup tables for
         """
 
         self.current_state = current
         self.target_state = target
+        self.target_key = target.key()
+        self.opened = deque()
+        self.opened_keys = TranspositionTable(expected)
+        self.closed = TranspositionTable(expected)
 
         if not self.is_solvable(self.current_state):
             raise RuntimeError("Unsolvable")
 
         self.opened.append(current)
+        self.opened_keys.add(current.key(), current.depth, current.move_code())
 
     def next_state(self):
         """Finds next state that the puzzle can be and loads it for processing
@@ -39,14 +45,26 @@ class UninformedSearchSolver:
             raise StopIteration
 
         observed_state: State = self.opened.popleft()
-        self.closed.add(observed_state)
+        self.opened_keys.remove(observed_state.key())
+        self.closed.add(observed_state.key(), observed_state.depth, observed_state.move_code())
 
         self.current_state = observed_state
         self.depth = observed_state.depth
 
-        for neighbor in observed_state.neighbors():
-            if neighbor not in self.closed and neighbor not in self.opened:
-                self.opened.append(neighbor)
+        # Only candidates that survive the duplicate checks become states
+        for key, blank, direction in observed_state.successors():
+            if key not in self.closed and key not in self.opened_keys:
+                child = observed_state.expand(key, direction, blank)
+
+                # Every board still on OPEN is at least as deep, so the goal
+                # can be taken as soon as it is generated
+                if key == self.target_key:
+                    self.current_state = child
+                    self.depth = child.depth
+                    return
+
+                self.opened.append(child)
+                self.opened_keys.add(key, child.depth, child.move_code())
 
     def is_solved(self) -> bool:
         """Checks if the search has found a solution
@@ -54,11 +72,19 @@ class UninformedSearchSolver:
         Returns:
             bool: is puzzle solved
         """
-        return self.current_state == self.target_state
+        return self.current_state.key() == self.target_key
 
     def is_solvable(self, state: State) -> bool:
 
-        return self.current_state.tile_reversals(state) % 2 == 0
+        return state.is_reachable(self.target_state)
+
+    def path(self) -> List[str]:
+        """Moves from the initial state to the current state
+
+        Returns:
+            List[str]: moves of the empty tile, in order
+        """
+        return self.current_state.path(self.closed)
 
     def run(self) -> int:
         """Runs the search"""
@@ -0,0 +1,33 @@
+from game.instances import DistanceTable, generate, goal_board, walks, write_corpus
+import argparse
+import time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write random instances of known optimal depth to a corpus")
+    parser.add_argument("path", help="output file, JSON lines if it ends in .jsonl, else binary")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--depth", type=int, nargs="+", default=[1, 31], help="exact depth, or lowest and highest")
+    parser.add_argument("--size", type=int, default=3, help="board width and height")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--walk", action="store_true", help="take random walks of --depth moves and label them with A*, for boards larger than 3x3")
+    args = parser.parse_args()
+    if len(args.depth) > 2 or args.depth[0] > args.depth[-1]:
+        parser.error("--depth takes an exact depth, or the lowest and highest depth")
+
+    start = time.perf_counter()
+    goal = goal_board(args.size)
+    depths = args.depth[0] if len(args.depth) == 1 else (args.depth[0], args.depth[1])
+
+    if args.walk:
+        instances = walks(goal, depths, args.count, args.seed)
+    else:
+        try:
+            table = DistanceTable(goal, max(args.depth))
+        except ValueError as error:
+            parser.error(str(error))
+        print(f"Distance table: {len(table)} boards up to depth {table.max_depth}")
+        instances = generate(goal, depths, args.count, args.seed, table)
+
+    written = write_corpus(args.path, instances)
+    print(f"Wrote {written} instances to {args.path} in {time.perf_counter() - start:.1f} s")
@@ -0,0 +1,261 @@
+from game.instances import generate, goal_board, read_corpus, walks
+from game.stats import percentile
+from game.solvers import SOLVERS
+from game.state import State
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+import argparse
+import json
+import time
+import tracemalloc
+
+"""
+Differential harness: runs every solver on the same instances and checks the answers.
+
+Each path is replayed from the start board to make sure it reaches the goal, and
+its length is compared with the reference A* solver, which in turn is checked
+against the optimal depth stored in the corpus. The report records nodes, time
+and optionally the traced memory peak of every run, and can be compared with
+the report of an earlier tree to catch answers that changed.
+"""
+
+REFERENCE = "optimal"
+
+# Solvers that promise a shortest path. The others only have to find a valid one.
+OPTIMAL_MODES = ("uninformed", "optimal")
+
+Task = Tuple[int, int, int, int, int, int, Tuple[str, ...], bool]
+
+
+def solve(mode: str, start: State, goal: State) -> Tuple[object, int]:
+    """Runs a solver to completion without printing
+
+    Returns:
+        the finished solver and the number of expanded states
+    """
+    solver = SOLVERS[mode](start, goal)
+    iterations = 0
+    while not solver.is_solved():
+        solver.next_state()
+        iterations += 1
+    return solver, iterations
+
+
+def replay(start: State, goal: State, path: List[str]) -> bool:
+    """Checks that a path of moves leads from start to goal"""
+    state = start
+    try:
+        for direction in path:
+            state = state.move(direction)
+    except IndexError:
+        return False
+    return state == goal
+
+
+def measure(mode: str, start: State, goal: State, memory: bool) -> dict:
+    """Solves one instance with one solver and records the result"""
+    began = time.perf_counter()
+    solver, iterations = solve(mode, start, goal)
+    elapsed = time.perf_counter() - began
+    path = solver.path()
+
+    result = {
+        "path": "".join(direction[0].upper() for direction in path),
+        "length": len(path),
+        "valid": replay(start, goal, path),
+        "nodes": iterations,
+        "closed": len(solver.closed),
+        "time": elapsed,
+    }
+
+    # Traced separately so that tracing does not slow down the timed run
+    if memory:
+        tracemalloc.start()
+        solve(mode, start, goal)
+        result["peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result
+
+
+def run_instance(task: Task) -> dict:
+    """Runs the reference and the requested solvers on one instance. Runs in the pool."""
+    index, start_key, goal_key, width, height, depth, modes, memory = task
+    start = State.from_key(start_key, width, height)
+    goal = State.from_key(goal_key, width, height)
+
+    results = {}
+    for mode in (REFERENCE,) + tuple(mode for mode in modes if mode != REFERENCE):
+        try:
+            results[mode] = measure(mode, start, goal, memory)
+        except Exception as error:
+            results[mode] = {"error": repr(error)}
+
+    optimal = results[REFERENCE].get("length", depth)
+    for mode, result in results.items():
+        if "error" in result:
+            result["status"] = "error"
+        elif not result["valid"]:
+            result["status"] = "invalid"
+        elif mode == REFERENCE and result["length"] != depth:
+            result["status"] = "not optimal"
+        elif result["length"] > optimal:
+            result["status"] = "not optimal" if mode in OPTIMAL_MODES else "suboptimal"
+        else:
+            result["status"] = "ok"
+
+    return {
+        "index": index,
+        "start": start_key,
+        "goal": goal_key,
+        "width": width,
+        "height": height,
+        "depth": depth,
+        "results": {mode: results[mode] for mode in modes},
+    }
+
+
+def summarize(records: List[dict], modes: Iterable[str]) -> Dict[str, dict]:
+    """Totals the results per solver"""
+    summary = {}
+    for mode in modes:
+        results = [record["results"][mode] for record in records]
+        solved = [result for result in results if "error" not in result]
+        statuses = [result["status"] for result in results]
+        times = [result["time"] for result in solved] or [0.0]
+
+        summary[mode] = {
+            "instances": len(results),
+            "failures": sum(status in ("error", "invalid", "not optimal") for status in statuses),
+            "suboptimal": statuses.count("suboptimal"),
+            "excess_moves": sum(
+                result["length"] - record["depth"]
+                for record, result in zip(records, results)
+                if result.get("status") == "suboptimal"
+            ),
+            "nodes": sum(result["nodes"] for result in solved),
+            "time": sum(times),
+            "time_p50": percentile(times, 0.50),
+            "time_p99": percentile(times, 0.99),
+        }
+        if all("peak" in result for result in solved) and solved:
+            summary[mode]["peak_max"] = max(result["peak"] for result in solved)
+
+    return summary
+
+
+def compare(records: List[dict], baseline: dict) -> List[str]:
+    """Lists the answers that differ from an earlier report
+
+    Node counts and times are allowed to change, paths are not.
+    """
+    earlier = {(record["start"], record["goal"]): record for record in baseline["instances"]}
+    regressions = []
+
+    for record in records:
+        before = earlier.get((record["start"], record["goal"]))
+        if before is None:
+            continue
+
+        for mode, result in record["results"].items():
+            old = before["results"].get(mode)
+            if old is None:
+                continue
+            if old.get("path") != result.get("path") or old.get("status") != result.get("status"):
+                regressions.append(
+                    f"Instance {record['index']} {mode}: "
+                    f"{old.get('status')} {old.get('path')!r} -> "
+                    f"{result.get('status')} {result.get('path')!r}"
+                )
+
+    return regressions
+
+
+def load_tasks(args: argparse.Namespace, modes: Tuple[str, ...]) -> List[Task]:
+    if args.corpus:
+        instances = read_corpus(args.corpus)
+    else:
+        goal = goal_board(args.size)
+        depths = args.depth[0] if len(args.depth) == 1 else (args.depth[0], args.depth[1])
+        if args.walk:
+            instances = walks(goal, depths, args.count, args.seed)
+        else:
+            instances = generate(goal, depths, args.count, args.seed)
+
+    return [
+        (index, start.key(), goal.key(), goal.width, goal.height, depth, modes, args.memory)
+        for index, (start, goal, depth) in enumerate(instances)
+    ]
+
+
+def print_summary(summary: Dict[str, dict]):
+    print(f"{'mode':<12}{'failures':>10}{'suboptimal':>12}{'nodes':>12}{'time s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>10}")
+    for mode, totals in summary.items():
+        peak = totals.get("peak_max")
+        print(
+            f"{mode:<12}{totals['failures']:>10}{totals['suboptimal']:>12}{totals['nodes']:>12}"
+            f"{totals['time']:>10.2f}{totals['time_p50'] * 1000:>10.1f}{totals['time_p99'] * 1000:>10.1f}"
+            f"{'-' if peak is None else format(peak / 1024, '.0f'):>10}"
+        )
+
+
+def harness(args: argparse.Namespace) -> bool:
+    modes = tuple(args.modes)
+    tasks = load_tasks(args, modes)
+
+    began = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        records = list(pool.map(run_instance, tasks))
+    print(f"Ran {len(records)} instances in {time.perf_counter() - began:.1f} s")
+
+    summary = summarize(records, modes)
+    print_summary(summary)
+
+    for record in records:
+        for mode, result in record["results"].items():
+            if result["status"] in ("error", "invalid", "not optimal"):
+                print(f"Instance {record['index']} {mode}: {result['status']} {result.get('error', '')}")
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(records, json.load(baseline))
+        print(f"{len(regressions)} answers changed since {args.baseline}")
+        for regression in regressions:
+            print(regression)
+
+    if args.report:
+        with open(args.report, "w") as report:
+            json.dump(
+                {"summary": summary, "regressions": regressions, "instances": records},
+                report,
+                indent=1,
+            )
+
+    return not regressions and not any(totals["failures"] for totals in summary.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check every solver against a reference on the same instances")
+    parser.add_argument("corpus", nargs="?", help="corpus file; instances are generated if left out")
+    parser.add_argument("--count", type=int, default=100, help="instances to generate")
+    parser.add_argument("--depth", type=int, nargs="+", default=[1, 20], help="exact depth, or lowest and highest")
+    parser.add_argument("--size", type=int, default=3, help="board width and height")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--walk", action="store_true", help="generate random walks of --depth moves instead, for boards larger than 3x3")
+    parser.add_argument("--modes", nargs="+", choices=sorted(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--workers", type=int, help="worker processes, one per CPU by default")
+    parser.add_argument("--memory", action="store_true", help="also record the traced memory peak")
+    parser.add_argument("--report", help="write the report to this JSON file")
+    parser.add_argument("--baseline", help="earlier report to compare answers with")
+
+    args = parser.parse_args()
+    if len(args.depth) > 2 or args.depth[0] > args.depth[-1]:
+        parser.error("--depth takes an exact depth, or the lowest and highest depth")
+
+    try:
+        passed = harness(args)
+    except ValueError as error:
+        parser.error(str(error))
+    if not passed:
+        exit(1)
@@ -0,0 +1,96 @@
+import argparse
+import pkgutil
+import subprocess
+import sys
+from typing import Dict
+import game
+
+# Every module in the package, none of which may import NumPy eagerly
+PACKAGE = ", ".join(f"game.{module.name}" for module in pkgutil.iter_modules(game.__path__))
+
+# Modules used by the scripts, mass_test.py and every solver worker, which are
+# held to the time budget. Only the server process loads the asyncio front end.
+FRONT_END = ("game.service",)
+CORE = ", ".join(
+    f"game.{module.name}"
+    for module in pkgutil.iter_modules(game.__path__)
+    if f"game.{module.name}" not in FRONT_END
+)
+
+# Nothing in the core may pull these in at import time
+HEAVY = ("numpy",)
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    """Runs one statement in a fresh interpreter under `-X importtime`
+
+    Returns:
+        Dict[str, int]: microseconds spent in each imported module, itself only
+    """
+    report = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+    times = {}
+    for line in report.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            own, _, module = line[len("import time:") :].split("|")
+            if own.strip().isdigit():
+                times[module.strip()] = int(own)
+    return times
+
+
+def cold_start(statement: str) -> float:
+    """Measures the modules a statement imports beyond a bare interpreter's
+
+    Returns:
+        float: milliseconds spent importing them
+    """
+    bare = import_times("pass")
+    return sum(
+        own for module, own in import_times(statement).items() if module not in bare
+    ) / 1000
+
+
+def heavy_imports() -> list:
+    """Lists the heavy modules loaded by importing the whole package"""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, {PACKAGE}; print(' '.join(sorted(sys.modules)))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return [module for module in HEAVY if module in output]
+
+
+def import_benchmark(runs: int, budget: float) -> bool:
+    # Noise only ever adds time, so the fastest run is the most faithful
+    samples = [cold_start(f"import {CORE}") for _ in range(runs)]
+    overhead = min(samples)
+
+    print("Core import overhead: {:.1f} ms (budget {:.1f} ms, slowest run {:.1f} ms)".format(
+        overhead, budget, max(samples)
+    ))
+
+    heavy = heavy_imports()
+    if heavy:
+        print("The package imports heavy modules:", ", ".join(heavy))
+
+    return not heavy and overhead <= budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Guard the cold-start cost of importing the solvers")
+    parser.add_argument("--runs", type=int, default=15, help="interpreter launches to take the fastest of")
+    parser.add_argument("--budget", type=float, default=60.0, help="allowed import overhead in ms")
+    args = parser.parse_args()
+
+    if not import_benchmark(args.runs, args.budget):
+        exit(1)
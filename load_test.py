@@ -0,0 +1,94 @@
+from game.stats import percentile
+from game.state import State
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List
+
+
+def random_problem(rng: random.Random, steps: int) -> dict:
+    """Walks the blank randomly away from the goal so the problem is solvable"""
+    goal = State([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+    state = goal
+    for _ in range(steps):
+        state = rng.choice(state.neighbors())
+
+    return {
+        "start": state.tile_seq,
+        "goal": goal.tile_seq,
+        "mode": "informed",
+    }
+
+
+async def send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, problem: dict) -> dict:
+    body = json.dumps(problem).encode()
+    writer.write(
+        b"POST /solve HTTP/1.1\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+
+    return json.loads(await reader.readexactly(length))
+
+
+async def client(args: argparse.Namespace, problems: List[dict], latencies: List[float]):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+
+    for problem in problems:
+        start = time.perf_counter()
+        result = await send(reader, writer, problem)
+        latencies.append(time.perf_counter() - start)
+        if "error" in result:
+            print("Server error:", result["error"])
+
+    writer.close()
+
+
+async def load_test(args: argparse.Namespace):
+    rng = random.Random(args.seed)
+    distinct = [random_problem(rng, args.steps) for _ in range(args.distinct)]
+    latencies: List[float] = []
+
+    # Each client gets its own stream of requests drawn from the distinct set,
+    # so identical problems are in flight at the same time and get coalesced.
+    streams = [
+        [rng.choice(distinct) for _ in range(args.requests)]
+        for _ in range(args.concurrency)
+    ]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, stream, latencies) for stream in streams))
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(latencies)} requests from {args.concurrency} clients in {elapsed:.2f} s")
+    print("Throughput: {:.1f} requests/s".format(len(latencies) / elapsed))
+    print("p50 latency: {:.2f} ms".format(percentile(latencies, 0.50) * 1000))
+    print("p99 latency: {:.2f} ms".format(percentile(latencies, 0.99) * 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure solver service latency under load")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8425)
+    parser.add_argument("--unix", help="connect to this Unix socket path instead of TCP")
+    parser.add_argument("--concurrency", type=int, default=16, help="number of clients")
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--distinct", type=int, default=8, help="number of distinct problems")
+    parser.add_argument("--steps", type=int, default=6, help="random moves away from the goal")
+    parser.add_argument("--seed", type=int, default=0)
+
+    asyncio.run(load_test(parser.parse_args()))
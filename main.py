@@ -8,7 +8,6 @@ Semester: Fall 2020
 Your names: Arseny Poga, Will St. Onge, and Trey Regruth
 """
 
-import numpy as np
 from game.state import State
 from game.uninformed_search import UninformedSearchSolver
 from game.informed_search import InformedSearchSolver
@@ -16,8 +15,8 @@ from game.informed_search import InformedSearchSolver
 
 def main():
     # initialize the init state and goal state as 2d array
-    init_tile = np.array([[1, 2, 3], [0, 4, 6], [7, 5, 8]])
-    goal_tile = np.array([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+    init_tile = [[1, 2, 3], [0, 4, 6], [7, 5, 8]]
+    goal_tile = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
 
     # 123046758
 
@@ -29,8 +28,8 @@ def main():
 
     try:
 
-        print(f"Initial State:\n{init_tile}")
-        print(f"Goal State:\n{goal_tile}")
+        print(f"Initial State:\n{init}")
+        print(f"Goal State:\n{goal}")
         uninformed_runs = uninformed_solver.run()
         informed_runs = informed_solver.run()
         print(
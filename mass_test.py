@@ -1,41 +1,34 @@
 from game.informed_search import InformedSearchSolver
 from game.uninformed_search import UninformedSearchSolver
+from game.instances import generate
 from game.state import State
-import numpy as np
 import sys
 import os
 
 
-def mass_test(iterations: int):
-    for i in range(iterations):
-        arr = np.arange(9).reshape((3, 3))
-        np.random.shuffle(arr)
-        init_state = State(arr)
+def mass_test(iterations: int, min_depth: int = 1, max_depth: int = 20):
+    goal = State([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+    instances = generate(goal, (min_depth, max_depth), iterations)
 
-        arr1 = np.arange(9).reshape((3, 3))
-        np.random.shuffle(arr1)
-        goal_state = State(arr1)
-        try:
-            informed_solver = InformedSearchSolver(init_state, goal_state)
-            uninformed_solver = UninformedSearchSolver(init_state, goal_state)
+    for i, (init_state, goal_state, depth) in enumerate(instances):
+        informed_solver = InformedSearchSolver(init_state, goal_state)
+        uninformed_solver = UninformedSearchSolver(init_state, goal_state)
 
-            sys.stdout = open(os.devnull, 'w')
-            informed_path = informed_solver.run()
-            uninformed_path = uninformed_solver.run()
-            sys.stdout = sys.__stdout__
+        sys.stdout = open(os.devnull, 'w')
+        informed_path = informed_solver.run()
+        uninformed_path = uninformed_solver.run()
+        sys.stdout = sys.__stdout__
 
-            if informed_path > uninformed_path:
-                print("Iteration", i, "- Informed path was longer than the uninformed")
-                print(init_state.tile_seq)
-                print("----------")
-                print(goal_state.tile_seq)
-        except RuntimeError:
-            pass
+        if informed_path > uninformed_path:
+            print("Iteration", i, "- Informed path was longer than the uninformed")
+            print("Optimal depth:", depth)
+            print(init_state)
+            print("----------")
+            print(goal_state)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python mass_test.py testCount")
+    if len(sys.argv) not in (2, 4):
+        print("Usage: python mass_test.py testCount [minDepth maxDepth]")
         exit(1)
-    mass_test(int(sys.argv[1]))
-
+    mass_test(*(int(arg) for arg in sys.argv[1:]))
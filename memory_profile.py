@@ -0,0 +1,51 @@
+from game.instances import generate, goal_board, random_walk
+from game.profiling import MemoryProfiler
+from game.solvers import SOLVERS
+import argparse
+import random
+
+
+def memory_profile(args: argparse.Namespace) -> MemoryProfiler:
+    goal = goal_board(args.size)
+
+    # Exact depths need a distance table, which only fits in memory for 3x3
+    if args.size <= 3:
+        start = next(generate(goal, args.depth, 1, args.seed)).start
+    else:
+        start = random_walk(goal, args.depth, random.Random(args.seed))
+
+    print(f"Start:\n{start}")
+    profiler = MemoryProfiler(
+        SOLVERS[args.mode](start, goal, args.expected),
+        args.every,
+        args.snapshot_every,
+        not args.no_trace,
+    )
+    iterations = profiler.run()
+    print(f"Solved in {iterations} iterations, {len(profiler.samples)} samples")
+
+    for column, peak in profiler.peaks().items():
+        if peak is not None:
+            unit = "entries" if column.endswith("entries") else "KiB"
+            print(f"  {column:<18}{peak if unit == 'entries' else peak // 1024:>12} {unit}")
+
+    if args.out:
+        profiler.export(args.out)
+        print(f"Wrote samples to {args.out}")
+
+    return profiler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the memory used by a solver's structures")
+    parser.add_argument("--mode", choices=sorted(SOLVERS), default="uninformed")
+    parser.add_argument("--size", type=int, default=3, help="board width and height")
+    parser.add_argument("--depth", type=int, default=20, help="optimal depth for 3x3, random walk length above")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--expected", type=int, default=1024, help="boards to preallocate tables for")
+    parser.add_argument("--every", type=int, default=500, help="expansions between samples")
+    parser.add_argument("--snapshot-every", type=int, default=10, help="samples between tracemalloc snapshots")
+    parser.add_argument("--no-trace", action="store_true", help="skip tracemalloc, counting bytes only")
+    parser.add_argument("--out", help="CSV file, or JSON with snapshots if it ends in .json")
+
+    memory_profile(parser.parse_args())
@@ -0,0 +1,33 @@
+from game.service import SolveService, serve
+import argparse
+import asyncio
+
+
+async def run_server(args: argparse.Namespace):
+    service = SolveService(args.workers, args.queue_size, time_limit=args.time_limit)
+    await service.start()
+
+    server = await serve(service, args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Serving solvers on {where} with {args.workers} workers")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the puzzle solvers over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8425)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--time-limit", type=float, default=10.0, help="seconds a single solve may run")
+
+    try:
+        asyncio.run(run_server(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
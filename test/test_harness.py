@@ -0,0 +1,42 @@
+import copy
+import unittest
+from game.state import State
+from harness import compare, replay, run_instance, summarize
+
+
+START = State([[1, 2, 3], [0, 4, 6], [7, 5, 8]])
+GOAL = State([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+MODES = ("uninformed", "informed", "optimal")
+
+
+class TestHarness(unittest.TestCase):
+    def test_replay(self):
+        self.assertTrue(replay(START, GOAL, ["right", "down", "right"]))
+        self.assertFalse(replay(START, GOAL, ["right", "down"]))
+        self.assertFalse(replay(START, GOAL, ["left"]))
+
+    def test_run_instance(self):
+        record = run_instance((0, START.key(), GOAL.key(), 3, 3, 3, MODES, True))
+
+        for mode in MODES:
+            result = record["results"][mode]
+            self.assertEqual(result["status"], "ok")
+            self.assertEqual(result["path"], "RDR")
+            self.assertGreater(result["peak"], 0)
+
+        self.assertEqual(record["results"]["uninformed"]["nodes"], 7)
+        self.assertEqual(summarize([record], MODES)["informed"]["failures"], 0)
+
+        # A corpus depth that disagrees with the reference is a failure
+        record = run_instance((0, START.key(), GOAL.key(), 3, 3, 2, ("optimal",), False))
+        self.assertEqual(record["results"]["optimal"]["status"], "not optimal")
+        self.assertEqual(summarize([record], ("optimal",))["optimal"]["failures"], 1)
+
+    def test_compare(self):
+        record = run_instance((0, START.key(), GOAL.key(), 3, 3, 3, MODES, False))
+        baseline = {"instances": [copy.deepcopy(record)]}
+
+        self.assertEqual(compare([record], baseline), [])
+
+        baseline["instances"][0]["results"]["informed"]["path"] = "DRR"
+        self.assertEqual(len(compare([record], baseline)), 1)
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import unittest
+from import_benchmark import CORE, PACKAGE, cold_start, heavy_imports, import_times
+
+
+class TestImports(unittest.TestCase):
+    def test_core_is_import_light(self):
+        self.assertEqual(heavy_imports(), [])
+
+    def test_guards_cover_the_package(self):
+        for module in ("game.service", "game.solvers", "game.optimal_search", "game.instances"):
+            self.assertIn(module, PACKAGE.split(", "))
+        self.assertEqual(set(PACKAGE.split(", ")) - set(CORE.split(", ")), {"game.service"})
+
+    def test_workers_do_not_load_asyncio(self):
+        output = subprocess.run(
+            [sys.executable, "-c", "import sys, game.solvers; print('asyncio' in sys.modules)"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+
+        self.assertEqual(output, ["False"])
+
+    def test_import_times_leave_out_the_interpreter(self):
+        times = import_times(f"import {CORE}")
+
+        self.assertIn("game.state", times)
+        self.assertNotIn("game.state", import_times("pass"))
+        self.assertGreater(cold_start(f"import {CORE}"), 0)
+
+    def test_flatten_loads_numpy_lazily(self):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                f"import sys, {CORE}\n"
+                "state = game.state.State([[1, 2], [3, 0]])\n"
+                "print('numpy' in sys.modules)\n"
+                "print(state.flatten().tolist(), 'numpy' in sys.modules)",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.splitlines()
+
+        self.assertEqual(output, ["False", "[1.0, 2.0, 3.0, 0.0] True"])
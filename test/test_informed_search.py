@@ -29,3 +29,12 @@ class TestInformedSearch(unittest.TestCase):
         with self.assertRaises(StopIteration):
             informed_solver.next_state()
 
+    def test_path(self):
+        init = State(np.array([[1, 2, 3], [0, 4, 6], [7, 5, 8]]))
+        goal = State(np.array([[1, 2, 3], [4, 5, 6], [7, 8, 0]]))
+
+        informed_solver = InformedSearchSolver(init, goal)
+        while not informed_solver.is_solved():
+            informed_solver.next_state()
+
+        self.assertEqual(informed_solver.path(), ["right", "down", "right"])
@@ -0,0 +1,95 @@
+import os
+import random
+import tempfile
+import unittest
+from game.instances import DistanceTable, generate, goal_board, random_walk, read_corpus, walks, write_corpus, map_corpus
+from game.state import State
+from game.uninformed_search import UninformedSearchSolver
+
+
+GOAL = State([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+
+
+class TestInstances(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = DistanceTable(GOAL, 12)
+
+    def test_distance_table(self):
+        self.assertEqual(self.table.max_depth, 12)
+        self.assertEqual([len(layer) for layer in self.table.layers[:5]], [1, 2, 4, 8, 16])
+        self.assertEqual(self.table.depth(State([[1, 2, 3], [0, 4, 6], [7, 5, 8]])), 3)
+
+        # Half of the 4! boards of a 2x2 puzzle are reachable
+        self.assertEqual(len(DistanceTable(State([[1, 2], [3, 0]]))), 12)
+
+    def test_generate_exact_depth(self):
+        instances = list(generate(GOAL, 8, 5, seed=1, table=self.table))
+
+        self.assertEqual(
+            [start.key() for start, _, _ in instances],
+            [start.key() for start, _, _ in generate(GOAL, 8, 5, seed=1, table=self.table)],
+        )
+
+        for start, goal, depth in instances:
+            self.assertEqual(depth, 8)
+            solver = UninformedSearchSolver(start, goal)
+            while not solver.is_solved():
+                solver.next_state()
+            self.assertEqual(solver.current_state.depth, 8)
+
+    def test_generate_depth_range(self):
+        depths = {depth for _, _, depth in generate(GOAL, (3, 6), 200, seed=2, table=self.table)}
+        self.assertEqual(depths, {3, 4, 5, 6})
+
+        with self.assertRaises(ValueError):
+            list(generate(GOAL, (13, 20), 1, table=self.table))
+
+    def test_random_walk(self):
+        goal = State([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 0]])
+        start = random_walk(goal, 30, random.Random(0))
+
+        self.assertTrue(start.is_reachable(goal))
+        self.assertEqual(sorted(start.tiles()), list(range(16)))
+
+    def test_large_tables_are_capped(self):
+        goal = goal_board(4)
+
+        for depth in (None, 17):
+            with self.assertRaises(ValueError):
+                DistanceTable(goal, depth)
+        with self.assertRaises(ValueError):
+            next(generate(goal, (1, 31), 1))
+
+    def test_walks(self):
+        for start, _, depth in walks(GOAL, (5, 12), 10, seed=4):
+            self.assertEqual(depth, self.table.depth(start))
+
+        depths = [depth for _, _, depth in walks(goal_board(4), 20, 3, seed=5)]
+        self.assertTrue(all(depth <= 20 and depth % 2 == 0 for depth in depths))
+
+    def test_corpus_round_trip(self):
+        instances = list(generate(GOAL, (1, 12), 20, seed=3, table=self.table))
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("corpus.bin", "corpus.jsonl"):
+                path = os.path.join(directory, name)
+
+                self.assertEqual(write_corpus(path, instances), 20)
+                self.assertEqual(list(read_corpus(path)), instances)
+                self.assertEqual(
+                    [depth for _, _, depth in read_corpus(path)],
+                    [depth for _, _, depth in instances],
+                )
+
+            mapped = map_corpus(os.path.join(directory, "corpus.bin"))
+            self.assertEqual(mapped["start"].tolist(), [start.key() for start, _, _ in instances])
+            self.assertEqual(mapped["depth"].tolist(), [depth for _, _, depth in instances])
+            del mapped
+
+            path = os.path.join(directory, "truncated.bin")
+            write_corpus(path, instances[:2])
+            with open(path, "ab") as corpus:
+                corpus.write(b"\0")
+            with self.assertRaises(ValueError):
+                list(read_corpus(path))
@@ -0,0 +1,44 @@
+import unittest
+from game.state import State
+from game.optimal_search import OptimalSearchSolver
+from game.instances import DistanceTable, generate
+
+
+class TestOptimalSearch(unittest.TestCase):
+    def test_next_state(self):
+        init = State([[1, 2, 3], [0, 4, 6], [7, 5, 8]])
+        goal = State([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+
+        optimal_solver = OptimalSearchSolver(init, goal)
+
+        self.assertEqual(len(optimal_solver.opened), 1)
+        self.assertEqual(len(optimal_solver.closed), 0)
+        self.assertEqual(optimal_solver.manhattan(init), 3)
+        optimal_solver.next_state()
+
+        self.assertEqual(len(optimal_solver.opened), 3)
+        self.assertEqual(len(optimal_solver.closed), 1)
+
+        self.assertEqual(optimal_solver.run(), 3)
+        self.assertEqual(optimal_solver.path(), ["right", "down", "right"])
+
+        with self.assertRaises(StopIteration):
+            optimal_solver.next_state()
+
+    def test_finds_shortest_paths(self):
+        goal = State([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+        table = DistanceTable(goal, 16)
+
+        for start, goal, depth in generate(goal, (0, 16), 30, seed=0, table=table):
+            optimal_solver = OptimalSearchSolver(start, goal)
+            optimal_solver.run()
+
+            self.assertEqual(optimal_solver.current_state.depth, depth)
+            self.assertEqual(len(optimal_solver.path()), depth)
+
+    def test_unsolvable(self):
+        with self.assertRaises(RuntimeError):
+            OptimalSearchSolver(
+                State([[2, 1, 3], [4, 5, 6], [7, 8, 0]]),
+                State([[1, 2, 3], [4, 5, 6], [7, 8, 0]]),
+            )
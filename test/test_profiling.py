@@ -0,0 +1,56 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from game.state import State
+from game.uninformed_search import UninformedSearchSolver
+from game.optimal_search import OptimalSearchSolver
+from game.profiling import MemoryProfiler, owned_bytes, structure_bytes
+
+
+START = State([[1, 2, 3], [0, 4, 6], [7, 5, 8]])
+GOAL = State([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+
+
+class TestProfiling(unittest.TestCase):
+    def test_owned_bytes(self):
+        self.assertEqual(owned_bytes(START), sys.getsizeof(START) + sys.getsizeof(START.key()))
+        self.assertEqual(owned_bytes((1, "right", None)), sys.getsizeof((1, "right", None)))
+        self.assertFalse(hasattr(START, "__dict__"))
+
+    def test_structure_bytes(self):
+        solver = UninformedSearchSolver(START, GOAL, 64)
+        table_bytes = structure_bytes(solver.closed)
+
+        self.assertGreater(table_bytes, solver.closed.nbytes)
+        self.assertLess(table_bytes, solver.closed.nbytes + 1024)
+
+    def test_run(self):
+        profiler = MemoryProfiler(UninformedSearchSolver(START, GOAL), every=5, snapshot_every=2)
+
+        self.assertEqual(profiler.run(), 7)
+        self.assertEqual([sample["iterations"] for sample in profiler.samples], [0, 5, 7])
+        self.assertEqual(profiler.samples[-1]["closed_entries"], 7)
+        self.assertEqual(profiler.samples[-1]["frontier_entries"], 6)
+        self.assertGreater(profiler.samples[-1]["arena_bytes"], 6 * sys.getsizeof(START))
+        self.assertGreater(profiler.peaks()["traced_peak"], 0)
+        self.assertEqual([snapshot["iterations"] for snapshot in profiler.snapshots], [0, 7])
+
+    def test_export(self):
+        profiler = MemoryProfiler(OptimalSearchSolver(START, GOAL), every=1, trace=False)
+        profiler.run()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.csv")
+            profiler.export(path)
+            with open(path) as output:
+                rows = list(csv.DictReader(output))
+            self.assertEqual([int(row["iterations"]) for row in rows], [0, 1, 2, 3, 4])
+            self.assertEqual(rows[0]["traced_bytes"], "")
+
+            path = os.path.join(directory, "profile.json")
+            profiler.export(path)
+            with open(path) as output:
+                self.assertEqual(json.load(output)["samples"], profiler.samples)
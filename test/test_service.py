@@ -0,0 +1,182 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+from game.instances import goal_board, random_walk
+from game.service import SolveService, route, run_solver, serve
+
+
+START = [[1, 2, 3], [0, 4, 6], [7, 5, 8]]
+GOAL = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+PATH = ["right", "down", "right"]
+
+# Far too deep for a breadth-first search
+LARGE_GOAL = goal_board(4)
+LARGE_START = random_walk(LARGE_GOAL, 200, random.Random(0))
+
+
+class TestSolveService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = SolveService(2, 4, ThreadPoolExecutor(2))
+        await self.service.start()
+
+    async def asyncTearDown(self):
+        await self.service.stop()
+
+    async def test_coalesces_identical_requests(self):
+        results = await asyncio.gather(
+            *(self.service.solve(START, GOAL) for _ in range(5))
+        )
+
+        self.assertEqual(self.service.solves, 1)
+        self.assertEqual(results, [{"iterations": 3, "depth": 3, "path": PATH}] * 5)
+        self.assertEqual(self.service.in_flight, {})
+
+    async def test_solve_many_keeps_order(self):
+        results = await self.service.solve_many(
+            [
+                {"start": START, "goal": GOAL, "mode": "uninformed"},
+                {"start": GOAL, "goal": GOAL},
+                {"start": [[2, 1, 3], [4, 5, 6], [7, 8, 0]], "goal": GOAL},
+                {"start": START, "goal": GOAL},
+                {"start": START, "goal": GOAL, "mode": "optimal"},
+            ]
+        )
+
+        self.assertEqual(
+            results,
+            [
+                {"iterations": 7, "depth": 3, "path": PATH},
+                {"iterations": 0, "depth": 0, "path": []},
+                {"error": "Unsolvable"},
+                {"iterations": 3, "depth": 3, "path": PATH},
+                {"iterations": 4, "depth": 3, "path": PATH},
+            ],
+        )
+
+    async def test_rejects_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            await self.service.solve(START, GOAL, "random")
+
+    async def test_rejects_malformed_boards(self):
+        for start, goal in (
+            ([[1, 2], [3, 0]], GOAL),
+            ([[1, 2, 3], [4, 5, 6], [7, 8, 8]], GOAL),
+            ([[1, 2, 3], [4, 5, 6], [7, 8, 9]], GOAL),
+            ([[1, 2, 3], [4, 5, 6], [7, 8, -1]], GOAL),
+            ([[1, 2, 3, 4, 5, 6, 7, 8, 0]], GOAL),
+        ):
+            with self.subTest(start=start):
+                with self.assertRaises(ValueError):
+                    await self.service.solve(start, goal)
+
+        self.assertEqual(self.service.solves, 0)
+        self.assertEqual(
+            await route(self.service, "POST", "/solve", json.dumps({"start": [[1, 2], [3, 0]], "goal": GOAL}).encode()),
+            ("400 Bad Request", {"error": "Start and goal boards must have the same shape"}),
+        )
+
+    async def test_worker_errors_are_server_errors(self):
+        with mock.patch("game.service.run_solver", side_effect=MemoryError):
+            status, payload = await route(
+                self.service, "POST", "/solve", json.dumps({"start": START, "goal": GOAL}).encode()
+            )
+
+        self.assertEqual(status, "500 Internal Server Error")
+        self.assertEqual(payload, {"error": "MemoryError()"})
+
+    async def test_cancelled_first_caller_keeps_shared_solve(self):
+        release = threading.Event()
+
+        def blocked(*key):
+            release.wait()
+            return run_solver(*key)
+
+        service = SolveService(1, 1, ThreadPoolExecutor(1))
+        await service.start()
+        try:
+            with mock.patch("game.service.run_solver", blocked):
+                running = asyncio.ensure_future(service.solve(GOAL, GOAL))
+                queued = asyncio.ensure_future(service.solve(GOAL, GOAL, "uninformed"))
+                await asyncio.sleep(0.01)
+
+                # The queue is full, so the first caller is still waiting to enqueue
+                first = asyncio.ensure_future(service.solve(START, GOAL))
+                joined = asyncio.ensure_future(service.solve(START, GOAL))
+                await asyncio.sleep(0.01)
+                first.cancel()
+                await asyncio.sleep(0.01)
+                release.set()
+
+                self.assertEqual(await asyncio.wait_for(joined, 5), {"iterations": 3, "depth": 3, "path": PATH})
+                await asyncio.gather(running, queued)
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            self.assertEqual(service.solves, 3)
+            self.assertEqual(service.in_flight, {})
+            self.assertEqual(service.waiters, {})
+        finally:
+            await service.stop()
+
+    async def test_time_limit(self):
+        result = run_solver(LARGE_START.tile_seq, LARGE_GOAL.tile_seq, "uninformed", 0.0)
+
+        self.assertEqual(result["error"], "Time limit of 0 s exceeded")
+
+    async def test_replaces_broken_pool(self):
+        service = SolveService(1, 1, ProcessPoolExecutor(1))
+        await service.start()
+        try:
+            broken = service.executor
+            with self.assertRaises(BrokenProcessPool):
+                await asyncio.wrap_future(broken.submit(os._exit, 1))
+
+            # Collected rather than caught by assertRaises, which clears the frames
+            # of the traceback, the suspended dispatcher included
+            failed, = await asyncio.gather(service.solve(START, GOAL), return_exceptions=True)
+            self.assertIsInstance(failed, BrokenProcessPool)
+            self.assertIsNot(service.executor, broken)
+            self.assertEqual((await service.solve(START, GOAL))["depth"], 3)
+        finally:
+            await service.stop()
+
+    async def test_stop_does_not_wait_for_busy_workers(self):
+        service = SolveService(1, 1, ProcessPoolExecutor(1), time_limit=60.0)
+        await service.start()
+        solve = asyncio.ensure_future(
+            service.solve(LARGE_START.tile_seq, LARGE_GOAL.tile_seq, "uninformed")
+        )
+        await asyncio.sleep(0.5)
+
+        began = time.perf_counter()
+        await service.stop()
+        self.assertLess(time.perf_counter() - began, 5)
+        solve.cancel()
+        await asyncio.gather(solve, return_exceptions=True)
+
+    async def test_http(self):
+        server = await serve(self.service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        body = json.dumps({"start": START, "goal": GOAL}).encode()
+        writer.write(
+            b"POST /solve HTTP/1.1\r\nConnection: close\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+        self.assertTrue(response.startswith(b"HTTP/1.1 200 OK"))
+        self.assertEqual(
+            json.loads(response.split(b"\r\n\r\n", 1)[1]), {"iterations": 3, "depth": 3, "path": PATH}
+        )
@@ -148,3 +148,55 @@ class TestState(unittest.TestCase):
         goal = State(goal_tile, 0, 0)
 
         self.assertEqual(init.euclidean_distance(goal), 7)
+
+    def test_is_reachable(self):
+        goal = State(np.array([[1, 2, 3], [4, 5, 6], [7, 8, 0]]))
+
+        self.assertTrue(State(np.array([[1, 2, 3], [0, 4, 6], [7, 5, 8]])).is_reachable(goal))
+        self.assertFalse(State(np.array([[2, 1, 3], [4, 5, 6], [7, 8, 0]])).is_reachable(goal))
+
+        # Even widths also depend on the row of the empty tile
+        goal = State(np.array([[1, 2], [3, 0]]))
+
+        self.assertTrue(State(np.array([[0, 1], [3, 2]])).is_reachable(goal))
+        self.assertFalse(State(np.array([[0, 2], [3, 1]])).is_reachable(goal))
+
+    def test_successors(self):
+        state = State(np.array([[1, 2, 3], [4, 0, 6], [7, 5, 8]]))
+        successors = list(state.successors())
+
+        self.assertEqual([direction for _, _, direction in successors], ["right", "left", "up", "down"])
+        self.assertEqual([blank for _, blank, _ in successors], [5, 3, 1, 7])
+
+        for (key, _, direction), neighbor in zip(successors, state.neighbors()):
+            self.assertEqual(key, state.move(direction).key())
+            self.assertEqual(key, neighbor.key())
+
+        corner = State(np.array([[0, 2, 3], [1, 4, 6], [7, 5, 8]]))
+        self.assertEqual([direction for _, _, direction in corner.successors()], ["right", "down"])
+
+    def test_expand(self):
+        state = State(np.array([[1, 2, 3], [4, 0, 6], [7, 5, 8]]), 2, 7)
+        key, blank, _ = next(state.successors())
+        child = state.expand(key)
+
+        self.assertTrue(np.all(child.tile_seq == np.array([[1, 2, 3], [4, 6, 0], [7, 5, 8]])))
+        self.assertEqual(child.depth, 3)
+        self.assertEqual(child, state.move("right"))
+
+        # A known empty tile is carried over instead of searched for
+        known = state.expand(key, "right", blank)
+        self.assertEqual(known._blank, 5)
+        self.assertEqual(known.blank(), child.blank())
+        self.assertEqual(list(known.successors()), list(child.successors()))
+
+    def test_board_limits(self):
+        fifteen = State(np.arange(16).reshape(4, 4))
+        self.assertEqual(fifteen.tiles(), list(range(16)))
+
+        with self.assertRaises(ValueError):
+            State(np.arange(25).reshape(5, 5))
+        with self.assertRaises(ValueError):
+            State(np.array([[1, 2], [16, 0]]))
+        with self.assertRaises(ValueError):
+            State(np.array([[1, 2], [-1, 0]]))
@@ -0,0 +1,11 @@
+import unittest
+from game.stats import percentile
+
+
+class TestStats(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(value) for value in range(100, 0, -1)]
+
+        self.assertEqual(percentile(values, 0.50), 51.0)
+        self.assertEqual(percentile(values, 0.99), 100.0)
+        self.assertEqual(percentile([3.0], 0.99), 3.0)
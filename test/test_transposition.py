@@ -0,0 +1,81 @@
+import random
+import unittest
+from game.transposition import TranspositionTable, NO_MOVE
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_add_and_get(self):
+        table = TranspositionTable(4)
+
+        table.add(0x876543210, 3, 1)
+        table.add(0x876543201)
+
+        self.assertEqual(len(table), 2)
+        self.assertIn(0x876543210, table)
+        self.assertNotIn(0x876543120, table)
+        self.assertEqual(table.get(0x876543210), (3, 1))
+        self.assertEqual(table.get(0x876543201), (0, NO_MOVE))
+
+        table.add(0x876543210, 2, 0)
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.get(0x876543210), (2, 0))
+
+        with self.assertRaises(KeyError):
+            table.get(0x876543120)
+
+        with self.assertRaises(OverflowError):
+            table.add(0x876543120, 256)
+
+        # The 1x1 board packs to the key that marks empty slots
+        with self.assertRaises(ValueError):
+            table.add(0)
+        self.assertEqual(len(table), 2)
+        self.assertNotIn(0, table)
+
+    def test_grow(self):
+        table = TranspositionTable(4)
+        capacity = table.capacity
+        keys = [(index << 4) | 1 for index in range(1, 200)]
+
+        for depth, key in enumerate(keys):
+            table.add(key, depth % 256)
+
+        self.assertGreater(table.capacity, capacity)
+        self.assertEqual(len(table), len(keys))
+        self.assertEqual(sorted(table), sorted(keys))
+        for depth, key in enumerate(keys):
+            self.assertEqual(table.get(key)[0], depth % 256)
+
+    def test_remove_matches_dict(self):
+        rng = random.Random(0)
+        table = TranspositionTable(16)
+        expected = {}
+
+        # Few distinct keys in a small table force long probe chains
+        for _ in range(2000):
+            key = rng.randrange(1, 16) << 60 | rng.randrange(1, 16)
+            if key in expected and rng.random() < 0.5:
+                table.remove(key)
+                del expected[key]
+            else:
+                depth = rng.randrange(256)
+                table.add(key, depth)
+                expected[key] = depth
+
+            self.assertEqual(len(table), len(expected))
+
+        for key, depth in expected.items():
+            self.assertEqual(table.get(key)[0], depth)
+
+        with self.assertRaises(KeyError):
+            table.remove(1)
+
+    def test_keys_above_63_bits(self):
+        table = TranspositionTable()
+        key = 0xFEDCBA9876543210
+
+        table.add(key, 80)
+
+        self.assertIn(key, table)
+        self.assertEqual(list(table), [key])
+        self.assertEqual(table.nbytes, table.capacity * 10)
@@ -42,35 +42,19 @@ class TestUninformedSearch(unittest.TestCase):
         self.assertEqual(len(uninformed_solver.closed), 6)
         uninformed_solver.next_state()
 
-        self.assertEqual(len(uninformed_solver.opened), 8)
+        # The goal is found among the successors, before they are added to OPEN
+        self.assertEqual(len(uninformed_solver.opened), 6)
         self.assertEqual(len(uninformed_solver.closed), 7)
-        uninformed_solver.next_state()
-
-        self.assertEqual(len(uninformed_solver.opened), 9)
-        self.assertEqual(len(uninformed_solver.closed), 8)
-        uninformed_solver.next_state()
-
-        self.assertEqual(len(uninformed_solver.opened), 10)
-        self.assertEqual(len(uninformed_solver.closed), 9)
-        uninformed_solver.next_state()
-
-        self.assertEqual(len(uninformed_solver.opened), 10)
-        self.assertEqual(len(uninformed_solver.closed), 10)
-        uninformed_solver.next_state()
-
-        self.assertEqual(len(uninformed_solver.opened), 10)
-        self.assertEqual(len(uninformed_solver.closed), 11)
-        uninformed_solver.next_state()
+        self.assertTrue(uninformed_solver.is_solved())
+        with self.assertRaises(StopIteration):
+            uninformed_solver.next_state()
 
-        self.assertEqual(len(uninformed_solver.opened), 10)
-        self.assertEqual(len(uninformed_solver.closed), 12)
-        uninformed_solver.next_state()
+    def test_path(self):
+        init = State(np.array([[1, 2, 3], [0, 4, 6], [7, 5, 8]]))
+        goal = State(np.array([[1, 2, 3], [4, 5, 6], [7, 8, 0]]))
 
-        self.assertEqual(len(uninformed_solver.opened), 10)
-        self.assertEqual(len(uninformed_solver.closed), 13)
-        uninformed_solver.next_state()
+        uninformed_solver = UninformedSearchSolver(init, goal)
+        self.assertEqual(uninformed_solver.path(), [])
 
-        self.assertEqual(len(uninformed_solver.opened), 10)
-        self.assertEqual(len(uninformed_solver.closed), 14)
-        with self.assertRaises(StopIteration):
-            uninformed_solver.next_state()
+        uninformed_solver.run()
+        self.assertEqual(uninformed_solver.path(), ["right", "down", "right"])